@@ -2,11 +2,19 @@
 Streamlit web interface for StrandsDocumentProcessor
 """
 import streamlit as st
+import functools
+import hashlib
 import os
 import json
+import pathlib
+import pickle
+import shutil
+import tempfile
+import threading
 import time
-from datetime import datetime
-import pandas as pd
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from src.agents.document_agent import StrandsDocumentAgent
 from src.agents.property_research_agent import PropertyResearchAgent
 from src.agents.document_qa_agent import DocumentQAAgent
@@ -21,7 +29,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -54,7 +62,25 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+@st.cache_resource
+def _inject_css():
+    """Emit the custom CSS once per session instead of on every rerun"""
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+@functools.lru_cache(maxsize=512)
+def _pretty(key):
+    """Title-case a snake_case key for display (cached; the same keys repeat every rerun)"""
+    return key.replace('_', ' ').title()
+
+def _money(x):
+    """Pre-format a currency value for display.
+
+    Rendered frames use pre-formatted string columns rather than pandas
+    Styler, which gets very slow beyond a few hundred rows.
+    """
+    return f"${x:,.0f}" if isinstance(x, (int, float)) else "N/A"
 
 def initialize_session_state():
     """Initialize session state variables"""
@@ -64,70 +90,258 @@ def initialize_session_state():
         st.session_state.research_results = []
     if 'qa_results' not in st.session_state:
         st.session_state.qa_results = []
-    if 'agent' not in st.session_state:
-        st.session_state.agent = None
-    if 'research_agent' not in st.session_state:
-        st.session_state.research_agent = None
-    if 'qa_agent' not in st.session_state:
-        st.session_state.qa_agent = None
     if 'current_qa_document' not in st.session_state:
         st.session_state.current_qa_document = None
     if 'qa_conversation' not in st.session_state:
-        st.session_state.qa_conversation = []
+        # Bounded so memory doesn't grow without limit over a long session
+        st.session_state.qa_conversation = deque(maxlen=200)
+    # LRU response cache for Q&A answers, keyed by (doc hash, question, context flag)
+    if 'qa_cache' not in st.session_state:
+        st.session_state.qa_cache = OrderedDict()
+    # Content-hash cache of ingested Q&A documents so identical re-uploads
+    # restore chunks instead of re-extracting
+    if 'qa_doc_cache' not in st.session_state:
+        st.session_state.qa_doc_cache = {}
+    # Running success counters so statistics stay O(1) instead of rescanning
+    # the result lists on every rerun
+    if 'processing_success_count' not in st.session_state:
+        st.session_state.processing_success_count = 0
+    if 'research_success_count' not in st.session_state:
+        st.session_state.research_success_count = 0
+    if 'qa_success_count' not in st.session_state:
+        st.session_state.qa_success_count = 0
+
+def _record_processing_result(result):
+    """Append a processing result and keep the success counter in sync"""
+    st.session_state.processing_results.append(result)
+    if result['success']:
+        st.session_state.processing_success_count += 1
+
+def _record_research_result(result):
+    """Append a research result and keep the success counter in sync"""
+    st.session_state.research_results.append(result)
+    if result['success']:
+        st.session_state.research_success_count += 1
+
+def _record_qa_exchange(question, result):
+    """Append a Q&A exchange and keep the success counter in sync"""
+    conversation = st.session_state.qa_conversation
+    # A full deque evicts its oldest entry on append; keep the counter
+    # scoped to the retained entries so the rate can't exceed 100%
+    if len(conversation) == conversation.maxlen and conversation[0]['result']['success']:
+        st.session_state.qa_success_count -= 1
+    conversation.append({
+        'question': question,
+        'result': result,
+        'timestamp': time.time()
+    })
+    if result['success']:
+        st.session_state.qa_success_count += 1
+
+@st.cache_resource(show_spinner="Initializing AI agent...")
+def get_document_agent(aws_profile):
+    """Create the shared document agent (one warm instance per process)"""
+    return StrandsDocumentAgent(aws_profile=aws_profile)
+
+@st.cache_resource(show_spinner="Initializing Property Research AI Agent...")
+def get_research_agent(aws_profile):
+    """Create the shared property research agent (one warm instance per process)"""
+    return PropertyResearchAgent(aws_profile=aws_profile)
+
+@st.cache_resource(show_spinner="Initializing Document Q&A AI Agent...")
+def get_qa_agent(aws_profile):
+    """Create the shared document Q&A agent (one warm instance per process)"""
+    return DocumentQAAgent(aws_profile=aws_profile)
 
 def create_agent():
-    """Create and cache the document agent"""
-    if st.session_state.agent is None:
-        with st.spinner("Initializing AI agent..."):
-            try:
-                st.session_state.agent = StrandsDocumentAgent(aws_profile=Config.AWS_PROFILE)
-                st.success("AI agent initialized successfully!")
-            except Exception as e:
-                st.error(f"Failed to initialize AI agent: {str(e)}")
-                return None
-    return st.session_state.agent
+    """Get the cached document agent, clearing the cache on failure so retries work"""
+    try:
+        return get_document_agent(Config.AWS_PROFILE)
+    except Exception as e:
+        st.cache_resource.clear()
+        st.error(f"Failed to initialize AI agent: {str(e)}")
+        return None
 
 def create_research_agent():
-    """Create and cache the property research agent"""
-    if st.session_state.research_agent is None:
-        with st.spinner("Initializing Property Research AI Agent..."):
-            try:
-                st.session_state.research_agent = PropertyResearchAgent(aws_profile=Config.AWS_PROFILE)
-                st.success("Property Research AI Agent initialized successfully!")
-            except Exception as e:
-                st.error(f"Failed to initialize Property Research Agent: {str(e)}")
-                return None
-    return st.session_state.research_agent
+    """Get the cached property research agent, clearing the cache on failure so retries work"""
+    try:
+        return get_research_agent(Config.AWS_PROFILE)
+    except Exception as e:
+        st.cache_resource.clear()
+        st.error(f"Failed to initialize Property Research Agent: {str(e)}")
+        return None
 
 def create_qa_agent():
-    """Create and cache the document Q&A agent"""
-    if st.session_state.qa_agent is None:
-        with st.spinner("Initializing Document Q&A AI Agent..."):
-            try:
-                st.session_state.qa_agent = DocumentQAAgent(aws_profile=Config.AWS_PROFILE)
-                st.success("Document Q&A AI Agent initialized successfully!")
-            except Exception as e:
-                st.error(f"Failed to initialize Document Q&A Agent: {str(e)}")
-                return None
-    return st.session_state.qa_agent
+    """Get the cached document Q&A agent, clearing the cache on failure so retries work"""
+    try:
+        return get_qa_agent(Config.AWS_PROFILE)
+    except Exception as e:
+        st.cache_resource.clear()
+        st.error(f"Failed to initialize Document Q&A Agent: {str(e)}")
+        return None
+
+@st.cache_data
+def get_supported_doctypes():
+    """Frozen session snapshot of the supported document types"""
+    return tuple(Config.DOCUMENT_TYPES)
+
+@st.cache_data
+def get_supported_formats():
+    """Frozen session snapshot of the supported upload formats"""
+    return tuple(Config.SUPPORTED_FORMATS)
+
+@st.cache_data(show_spinner=False)
+def _capabilities(aws_profile):
+    """Research agent capabilities, computed once instead of on every rerun"""
+    return get_research_agent(aws_profile).get_agent_capabilities()
+
+@st.cache_data(show_spinner=False)
+def _compute_batch_stats(results_tuple, aws_profile):
+    """Aggregate batch statistics once per distinct result set instead of on
+    every rerun"""
+    return get_document_agent(aws_profile).get_processing_statistics(list(results_tuple))
+
+@st.cache_data(show_spinner=False)
+def _type_distribution_df(distribution_items):
+    """Document-type distribution frame for the batch bar chart, cached on
+    the distribution itself"""
+    import pandas as pd
+    return pd.DataFrame(
+        list(distribution_items),
+        columns=['Document Type', 'Count']
+    ).set_index('Document Type')
+
+@st.cache_data
+def get_doctype_markdown():
+    """Pre-rendered document type bullet list for the sidebar"""
+    return "\n".join(f"- {_pretty(doc_type)}" for doc_type in get_supported_doctypes())
+
+# Uploads directory is created once at import instead of per upload call
+UPLOADS_DIR = pathlib.Path("uploads")
+UPLOADS_DIR.mkdir(exist_ok=True)
+
+# Content-addressed on-disk cache of ingested Q&A documents, so re-loading a
+# known file stays instant across process restarts
+RAG_CACHE_DIR = pathlib.Path(".rag_cache")
+RAG_CACHE_DIR.mkdir(exist_ok=True)
+
+def _load_cached_qa_doc(doc_hash):
+    """Read a document snapshot from the disk cache, or None if absent"""
+    path = RAG_CACHE_DIR / f"{doc_hash}.pkl"
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def _store_cached_qa_doc(doc_hash, entry):
+    """Persist a document snapshot keyed by content hash; failures are
+    non-fatal since the cache is an optimization"""
+    try:
+        with open(RAG_CACHE_DIR / f"{doc_hash}.pkl", "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+def _read_uploaded_bytes(uploaded_file):
+    """Read an uploaded file into a mutable bytearray in 64 KiB chunks,
+    avoiding the quadratic cost of immutable-bytes appends on large files"""
+    uploaded_file.seek(0)
+    buf = bytearray()
+    while True:
+        chunk = uploaded_file.read(65536)
+        if not chunk:
+            break
+        buf.extend(chunk)
+    return bytes(buf)
+
+@st.cache_data(show_spinner="Loading document for Q&A...")
+def _load_qa_document(file_bytes, file_name, aws_profile):
+    """Load and summarize a document for Q&A, cached on content so re-uploads
+    of the same file skip reprocessing entirely
+
+    Returns the workflow result together with a snapshot of the ingested
+    document: on a data-cache hit the workflow does not run, so the caller
+    must re-install the snapshot rather than assume the shared agent still
+    holds this document."""
+    qa_agent = get_qa_agent(aws_profile)
+
+    file_path = str(UPLOADS_DIR / f"{time.strftime('%Y%m%d_%H%M%S')}_{file_name}")
+
+    with open(file_path, "wb") as f:
+        f.write(file_bytes)
+
+    try:
+        result = qa_agent.load_document_workflow(file_path)
+        document = dict(qa_agent.rag_tool.current_document) if result['success'] else None
+        return result, document
+    finally:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+def _unlink_all(paths):
+    """Remove a list of staged files; run from a daemon thread so cleanup
+    never blocks the UI"""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
 
 def save_uploaded_file(uploaded_file):
-    """Save uploaded file to uploads directory"""
-    uploads_dir = "uploads"
-    os.makedirs(uploads_dir, exist_ok=True)
-    
+    """Save uploaded file to uploads directory
+
+    Streams the upload to disk in 1 MiB chunks and hashes the same bytes
+    incrementally, so the file is never materialized in memory and is only
+    traversed once.
+
+    Returns:
+        Tuple of (file_path, SHA1 hex digest of the file contents)
+    """
     # Create unique filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{uploaded_file.name}"
-    file_path = os.path.join(uploads_dir, filename)
-    
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-    
-    return file_path
+    filename = f"{time.strftime('%Y%m%d_%H%M%S')}_{uploaded_file.name}"
+    file_path = str(UPLOADS_DIR / filename)
+
+    hasher = hashlib.sha1()
+    uploaded_file.seek(0)
+    with open(file_path, "wb", buffering=1 << 20) as f:
+        while True:
+            chunk = uploaded_file.read(1 << 20)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            f.write(chunk)
+
+    return file_path, hasher.hexdigest()
+
+@contextmanager
+def staged_upload(uploaded_file):
+    """Stage an upload on disk for the duration of a with-block, guaranteeing
+    cleanup even when processing fails"""
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(
+        delete=False, dir=str(UPLOADS_DIR), suffix=f"_{uploaded_file.name}"
+    ) as f:
+        shutil.copyfileobj(uploaded_file, f, length=65536)
+        file_path = f.name
+
+    try:
+        yield file_path
+    finally:
+        try:
+            os.unlink(file_path)
+        except OSError:
+            pass
 
 def display_processing_result(result):
     """Display processing result in a formatted way"""
+    # Deferred so Streamlit cold start doesn't pay the pandas import cost
+    import pandas as pd
+
     if result['success']:
         st.markdown('<div class="success-box">', unsafe_allow_html=True)
         st.write("✅ **Processing Successful**")
@@ -149,25 +363,26 @@ def display_processing_result(result):
         # Document Metadata
         with st.expander("📊 Document Metadata"):
             metadata = final_result.get('document_metadata', {})
-            for key, value in metadata.items():
-                st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+            if metadata:
+                metadata_df = pd.DataFrame(
+                    [(_pretty(key), str(value)) for key, value in metadata.items()],
+                    columns=['Field', 'Value']
+                )
+                st.dataframe(metadata_df, use_container_width=True)
         
         # Extracted Data
         st.subheader("🔍 Extracted Data")
         extracted_data = final_result.get('extracted_data', {})
         
         if extracted_data:
-            # Convert to DataFrame for better display
-            data_items = []
-            for key, value in extracted_data.items():
-                if value is not None:
-                    data_items.append({
-                        'Field': key.replace('_', ' ').title(),
-                        'Value': str(value)
-                    })
-            
-            if data_items:
-                df = pd.DataFrame(data_items)
+            # Build column arrays once instead of appending per-row dicts
+            keys = [key for key, value in extracted_data.items() if value is not None]
+
+            if keys:
+                df = pd.DataFrame({
+                    'Field': [_pretty(key) for key in keys],
+                    'Value': [str(extracted_data[key]) for key in keys]
+                })
                 st.dataframe(df, use_container_width=True)
             else:
                 st.info("No data could be extracted from this document.")
@@ -180,9 +395,11 @@ def display_processing_result(result):
             with st.expander("📝 Processing Notes"):
                 st.write(processing_notes)
         
-        # Raw JSON (for debugging)
-        with st.expander("🔧 Raw Processing Result (JSON)"):
-            st.json(result)
+        # Raw JSON (for debugging) - slim collapsed summary by default, full
+        # dump only when requested (capped at 200 KiB)
+        st.json({k: result.get(k) for k in ('success', 'file_path', 'error')}, expanded=False)
+        with st.expander("🔧 Full processing result (JSON)"):
+            st.code(json.dumps(result, indent=2, default=str)[:200_000], language="json")
     
     else:
         st.markdown('<div class="error-box">', unsafe_allow_html=True)
@@ -192,6 +409,8 @@ def display_processing_result(result):
 
 def display_property_research_result(result):
     """Display property research result in a comprehensive format"""
+    import pandas as pd
+
     if result['success']:
         st.markdown('<div class="success-box">', unsafe_allow_html=True)
         st.write("✅ **Property Research Completed Successfully**")
@@ -206,15 +425,13 @@ def display_property_research_result(result):
         report = result.get('comprehensive_report', {})
         property_summary = report.get('property_summary', {})
         
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Sale Price", f"${property_summary.get('sale_price', 0):,}")
-        with col2:
-            st.metric("Current Est. Value", f"${property_summary.get('estimated_current_value', 0):,}")
-        with col3:
-            st.metric("Property Type", property_summary.get('property_type', 'N/A'))
-        with col4:
-            st.metric("Closing Date", property_summary.get('closing_date', 'N/A'))
+        summary_df = pd.DataFrame([{
+            'Sale Price': _money(property_summary.get('sale_price', 0)),
+            'Current Est. Value': _money(property_summary.get('estimated_current_value', 0)),
+            'Property Type': property_summary.get('property_type', 'N/A'),
+            'Closing Date': property_summary.get('closing_date', 'N/A')
+        }])
+        st.dataframe(summary_df, hide_index=True, use_container_width=True)
         
         # Address
         st.write(f"📍 **Address:** {property_summary.get('address', 'N/A')}")
@@ -223,26 +440,16 @@ def display_property_research_result(result):
         st.header("💰 Financial Analysis")
         financial_analysis = report.get('financial_analysis', {})
         
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            value_change = financial_analysis.get('value_change', {})
-            change_amount = value_change.get('amount', 0)
-            change_pct = value_change.get('percentage', 0)
-            direction = value_change.get('direction', 'unknown')
-            
-            delta_color = "normal" if direction == "increase" else "inverse" if direction == "decrease" else "off"
-            st.metric(
-                "Value Change", 
-                f"${change_amount:,.0f}",
-                delta=f"{change_pct:+.1f}%",
-                delta_color=delta_color
-            )
-        
-        with col2:
-            st.metric("Commission Paid", f"${financial_analysis.get('commission_paid', 0):,}")
-        
-        with col3:
-            st.metric("Price per Sq Ft", f"${financial_analysis.get('price_per_sqft', 0):.0f}")
+        value_change = financial_analysis.get('value_change', {})
+        change_amount = value_change.get('amount', 0)
+        change_pct = value_change.get('percentage', 0)
+
+        financial_df = pd.DataFrame([{
+            'Value Change': f"${change_amount:,.0f} ({change_pct:+.1f}%)",
+            'Commission Paid': _money(financial_analysis.get('commission_paid', 0)),
+            'Price per Sq Ft': f"${financial_analysis.get('price_per_sqft', 0):.0f}"
+        }])
+        st.dataframe(financial_df, hide_index=True, use_container_width=True)
         
         # Market Analysis
         st.header("📊 Market Analysis")
@@ -252,8 +459,11 @@ def display_property_research_result(result):
         with col1:
             st.subheader("Market Trends")
             market_trends = market_analysis.get('market_trends', {})
-            for key, value in market_trends.items():
-                st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+            if market_trends:
+                st.markdown("\n".join(
+                    f"- **{_pretty(key)}:** {value}"
+                    for key, value in market_trends.items()
+                ))
         
         with col2:
             st.subheader("Market Metrics")
@@ -264,40 +474,36 @@ def display_property_research_result(result):
         comparable_properties = market_analysis.get('comparable_properties', [])
         if comparable_properties:
             st.subheader("🏘️ Comparable Properties")
-            comp_data = []
-            for comp in comparable_properties:
-                if 'error' not in comp:
-                    comp_data.append({
-                        'Address': comp.get('address', 'N/A'),
-                        'Sale Price': f"${comp.get('sale_price', 0):,}",
-                        'Sale Date': comp.get('sale_date', 'N/A'),
-                        'Sq Ft': f"{comp.get('square_footage', 0):,}",
-                        'Bed/Bath': f"{comp.get('bedrooms', 0)}/{comp.get('bathrooms', 0)}",
-                        'Distance': f"{comp.get('distance_miles', 0):.1f} mi"
-                    })
-            
-            if comp_data:
-                comp_df = pd.DataFrame(comp_data)
+            # Build column arrays in one pass each instead of per-row dicts
+            valid = [comp for comp in comparable_properties if 'error' not in comp]
+
+            if valid:
+                comp_df = pd.DataFrame({
+                    'Address': [comp.get('address', 'N/A') for comp in valid],
+                    'Sale Price': [_money(comp.get('sale_price', 0)) for comp in valid],
+                    'Sale Date': [comp.get('sale_date', 'N/A') for comp in valid],
+                    'Sq Ft': [f"{comp.get('square_footage', 0):,}" for comp in valid],
+                    'Bed/Bath': [f"{comp.get('bedrooms', 0)}/{comp.get('bathrooms', 0)}" for comp in valid],
+                    'Distance': [f"{comp.get('distance_miles', 0):.1f} mi" for comp in valid]
+                })
                 st.dataframe(comp_df, use_container_width=True)
         
         # Neighborhood Analysis
         st.header("🏘️ Neighborhood Analysis")
         neighborhood_analysis = report.get('neighborhood_analysis', {})
         
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Walkability Score", f"{neighborhood_analysis.get('walkability_score', 0)}/100")
-        with col2:
-            st.metric("Transit Score", f"{neighborhood_analysis.get('transit_score', 0)}/100")
-        with col3:
-            st.metric("Bike Score", f"{neighborhood_analysis.get('bike_score', 0)}/100")
+        scores_df = pd.DataFrame([{
+            'Walkability Score': f"{neighborhood_analysis.get('walkability_score', 0)}/100",
+            'Transit Score': f"{neighborhood_analysis.get('transit_score', 0)}/100",
+            'Bike Score': f"{neighborhood_analysis.get('bike_score', 0)}/100"
+        }])
+        st.dataframe(scores_df, hide_index=True, use_container_width=True)
         
         # Nearby Amenities
         amenities = neighborhood_analysis.get('nearby_amenities', [])
         if amenities:
             st.subheader("🏪 Nearby Amenities")
-            for amenity in amenities:
-                st.write(f"• {amenity}")
+            st.markdown("\n".join(f"- {amenity}" for amenity in amenities))
         
         # School Information
         school_info = neighborhood_analysis.get('school_information', {})
@@ -314,7 +520,7 @@ def display_property_research_result(result):
                 for school_type in ['elementary_schools', 'middle_schools', 'high_schools']:
                     schools = school_info.get(school_type, [])
                     if schools:
-                        st.write(f"**{school_type.replace('_', ' ').title()}:**")
+                        st.write(f"**{_pretty(school_type)}:**")
                         for school in schools:
                             st.write(f"• {school.get('name', 'N/A')} - Rating: {school.get('rating', 0)}/10")
         
@@ -328,10 +534,11 @@ def display_property_research_result(result):
             with col2:
                 st.metric("Safety Score", f"{crime_stats.get('safety_score', 0)}/100")
             with col3:
-                st.write("**Recent Incidents:**")
                 incidents = crime_stats.get('recent_incidents', [])
-                for incident in incidents[:3]:  # Show first 3
-                    st.write(f"• {incident.get('type', 'N/A')} ({incident.get('distance', 'N/A')})")
+                st.markdown("**Recent Incidents:**\n" + "\n".join(
+                    f"- {incident.get('type', 'N/A')} ({incident.get('distance', 'N/A')})"
+                    for incident in incidents[:3]  # Show first 3
+                ))
         
         # AI Insights
         st.header("🤖 AI Insights & Analysis")
@@ -360,23 +567,21 @@ def display_property_research_result(result):
                 with col1:
                     market_risks = risk_assessment.get('market_risks', [])
                     if market_risks:
-                        st.write("**Market Risks:**")
-                        for risk in market_risks:
-                            st.write(f"• {risk}")
-                
+                        st.markdown("**Market Risks:**\n" + "\n".join(f"- {risk}" for risk in market_risks))
+
                 with col2:
                     property_risks = risk_assessment.get('property_risks', [])
                     if property_risks:
-                        st.write("**Property Risks:**")
-                        for risk in property_risks:
-                            st.write(f"• {risk}")
+                        st.markdown("**Property Risks:**\n" + "\n".join(f"- {risk}" for risk in property_risks))
             
             # Recommendations
             recommendations = ai_insights.get('recommendations', [])
             if recommendations:
                 st.subheader("💡 AI Recommendations")
-                for i, recommendation in enumerate(recommendations, 1):
-                    st.write(f"{i}. {recommendation}")
+                st.markdown("\n".join(
+                    f"{i}. {recommendation}"
+                    for i, recommendation in enumerate(recommendations, 1)
+                ))
         
         else:
             st.warning("AI insights generation encountered issues. Basic analysis completed.")
@@ -386,11 +591,13 @@ def display_property_research_result(result):
             workflow_steps = result.get('workflow_steps', [])
             for step in workflow_steps:
                 status_icon = "✅" if step.get('status') == 'completed' else "❌"
-                st.write(f"{status_icon} **{step.get('step', 'Unknown').replace('_', ' ').title()}**")
+                st.write(f"{status_icon} **{_pretty(step.get('step', 'Unknown'))}**")
         
-        # Raw Data (for debugging)
-        with st.expander("🔧 Raw Research Result (JSON)"):
-            st.json(result)
+        # Raw Data (for debugging) - slim collapsed summary by default, full
+        # dump only when requested (capped at 200 KiB)
+        st.json({k: result.get(k) for k in ('success', 'processing_time', 'error')}, expanded=False)
+        with st.expander("🔧 Full research result (JSON)"):
+            st.code(json.dumps(result, indent=2, default=str)[:200_000], language="json")
     
     else:
         st.markdown('<div class="error-box">', unsafe_allow_html=True)
@@ -482,10 +689,591 @@ def display_qa_answer(result):
         st.write(f"**Error:** {result.get('error', 'Unknown error')}")
         st.markdown('</div>', unsafe_allow_html=True)
 
+@st.fragment
+def _tab_upload():
+    st.header("Single Document Processing")
+
+    # File upload
+    uploaded_file = st.file_uploader(
+        "Choose a document file",
+        type=['pdf', 'png', 'jpg', 'jpeg', 'tiff'],
+        help=f"Supported formats: {', '.join(get_supported_formats())}"
+    )
+
+    if uploaded_file is not None:
+        # Display file info
+        st.write(f"**File:** {uploaded_file.name}")
+        st.write(f"**Size:** {uploaded_file.size / 1024 / 1024:.2f} MB")
+
+        # Process button
+        if st.button("🚀 Process Document", type="primary"):
+            agent = create_agent()
+            if agent is None:
+                st.error("Cannot process document: AI agent initialization failed")
+                return
+
+            try:
+                # Stage the upload on disk; cleanup happens when the block exits
+                with staged_upload(uploaded_file) as file_path:
+                    # Process document, surfacing workflow steps on a status line
+                    status_line = st.empty()
+
+                    def show_progress(step, info):
+                        message = info.get('message')
+                        if message:
+                            status_line.caption(message)
+
+                    with st.spinner("Processing document... This may take a few moments."):
+                        start_time = time.time()
+                        result = agent.process_document_workflow(file_path,
+                                                                 progress_callback=show_progress)
+                        processing_time = time.time() - start_time
+                    status_line.empty()
+
+                    # Add processing time to result
+                    if result['success']:
+                        result['final_result']['processing_time_seconds'] = processing_time
+
+                # Store result
+                _record_processing_result(result)
+
+                # Display result
+                display_processing_result(result)
+
+            except Exception as e:
+                st.error(f"Processing failed: {str(e)}")
+
+@st.fragment
+def _tab_research():
+    st.header("🔍 Property Research with Agentic AI")
+    st.markdown("""
+    <div class="info-box">
+    <strong>🤖 Agentic AI Property Research</strong><br>
+    Upload a settlement document and our AI agent will:
+    <ul>
+    <li>📄 Process and extract property details from the document</li>
+    <li>🌐 Search the web for current market information</li>
+    <li>📊 Analyze market trends and comparable properties</li>
+    <li>🏘️ Research neighborhood information and amenities</li>
+    <li>🎓 Find school ratings and district information</li>
+    <li>🚔 Provide safety and crime statistics</li>
+    <li>💡 Generate AI-powered investment insights and recommendations</li>
+    </ul>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # File upload for property research
+    research_file = st.file_uploader(
+        "Upload Settlement Document for Property Research",
+        type=['pdf', 'png', 'jpg', 'jpeg', 'tiff'],
+        help="Upload a settlement document to research the property",
+        key="research_uploader"
+    )
+
+    if research_file is not None:
+        # Display file info
+        st.write(f"**File:** {research_file.name}")
+        st.write(f"**Size:** {research_file.size / 1024 / 1024:.2f} MB")
+
+        # Research options
+        st.subheader("🔧 Research Options")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            include_market_analysis = st.checkbox("Include Market Analysis", value=True)
+            include_neighborhood_info = st.checkbox("Include Neighborhood Information", value=True)
+            include_school_info = st.checkbox("Include School Information", value=True)
+
+        with col2:
+            include_crime_stats = st.checkbox("Include Crime Statistics", value=True)
+            include_ai_insights = st.checkbox("Generate AI Insights", value=True)
+            include_investment_analysis = st.checkbox("Include Investment Analysis", value=True)
+
+        # Process button
+        if st.button("🚀 Start Property Research", type="primary", key="research_button"):
+            research_agent = create_research_agent()
+            if research_agent is None:
+                st.error("Cannot start property research: AI agent initialization failed")
+                return
+
+            try:
+                # Show agent capabilities
+                with st.expander("🤖 Agent Capabilities"):
+                    capabilities = _capabilities(Config.AWS_PROFILE)
+                    st.write(f"**Agent Name:** {capabilities['name']}")
+                    st.write(f"**Description:** {capabilities['description']}")
+                    st.write("**Capabilities:**")
+                    for capability in capabilities['capabilities']:
+                        st.write(f"• {capability}")
+
+                # Stage the upload on disk; cleanup happens when the block exits
+                with staged_upload(research_file) as file_path:
+                    # Process with a single status container (no artificial delays)
+                    with st.status("🔄 Researching property...", expanded=True) as status:
+                        start_time = time.time()
+                        result = research_agent.research_property_workflow(file_path)
+                        processing_time = time.time() - start_time
+
+                        status.update(
+                            label=f"✅ Research completed in {processing_time:.2f} seconds!",
+                            state="complete"
+                        )
+
+                # Store result
+                _record_research_result(result)
+
+                # Display comprehensive results
+                st.markdown("---")
+                display_property_research_result(result)
+
+            except Exception as e:
+                st.error(f"Property research failed: {str(e)}")
+                import traceback
+                st.error(f"Detailed error: {traceback.format_exc()}")
+
+    # Research History
+    if st.session_state.research_results:
+        st.markdown("---")
+        st.subheader("📚 Research History")
+
+        # Summary statistics
+        total_researched = len(st.session_state.research_results)
+        successful_research = st.session_state.research_success_count
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Properties Researched", total_researched)
+        with col2:
+            st.metric("Successful Research", successful_research)
+        with col3:
+            success_rate = (successful_research / total_researched * 100) if total_researched > 0 else 0
+            st.metric("Success Rate", f"{success_rate:.1f}%")
+
+        # Recent research results, newest first via index arithmetic so no
+        # slice copy is allocated on every rerun
+        with st.expander("📋 Recent Research Results"):
+            n = len(st.session_state.research_results)
+            for i, idx in enumerate(range(n - 1, max(n - 6, -1), -1), 1):
+                result = st.session_state.research_results[idx]
+                if result['success']:
+                    report = result.get('comprehensive_report', {})
+                    property_summary = report.get('property_summary', {})
+                    st.write(f"**{i}.** {property_summary.get('address', 'Unknown Address')} - "
+                            f"${property_summary.get('sale_price', 0):,} "
+                            f"({property_summary.get('closing_date', 'Unknown Date')})")
+                else:
+                    st.write(f"**{i}.** Research failed: {result.get('error', 'Unknown error')}")
+
+@st.fragment
+def _tab_qa():
+    st.header("💬 Document Q&A with RAG")
+    st.markdown("""
+    <div class="info-box">
+    <strong>🤖 Intelligent Document Q&A</strong><br>
+    Upload any document and ask questions about its content using RAG (Retrieval-Augmented Generation):
+    <ul>
+    <li>📄 Load and process documents (PDF, images)</li>
+    <li>🔍 Intelligent text chunking and retrieval</li>
+    <li>💬 Ask natural language questions</li>
+    <li>🎯 Get accurate answers with source citations</li>
+    <li>📚 Maintain conversation context</li>
+    <li>📋 Generate document summaries</li>
+    </ul>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Document loading section
+    st.subheader("📄 Step 1: Load Document")
+
+    # Check if document is already loaded
+    if st.session_state.current_qa_document:
+        st.success(f"✅ Document loaded: {st.session_state.current_qa_document.get('file_name', 'Unknown')}")
+
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write(f"**Chunks:** {st.session_state.current_qa_document.get('chunks_count', 0)}")
+            st.write(f"**Text Length:** {st.session_state.current_qa_document.get('text_length', 0):,} characters")
+        with col2:
+            if st.button("🗑️ Clear Document", key="clear_qa_doc"):
+                st.session_state.current_qa_document = None
+                st.session_state.qa_conversation = deque(maxlen=200)
+                st.session_state.qa_success_count = 0
+                st.session_state.pop('qa_suggested_cache', None)
+                qa_agent = create_qa_agent()
+                if qa_agent:
+                    qa_agent.rag_tool.clear_document()
+                    qa_agent.clear_conversation()
+                st.rerun()
+
+    # File upload for Q&A
+    qa_file = st.file_uploader(
+        "Upload Document for Q&A",
+        type=['pdf', 'png', 'jpg', 'jpeg', 'tiff'],
+        help="Upload any document to ask questions about its content",
+        key="qa_uploader"
+    )
+
+    if qa_file is not None and not st.session_state.current_qa_document:
+        st.write(f"**File:** {qa_file.name}")
+        st.write(f"**Size:** {qa_file.size / 1024 / 1024:.2f} MB")
+
+        if st.button("📚 Load Document for Q&A", type="primary", key="load_qa_doc"):
+            qa_agent = create_qa_agent()
+            if qa_agent is None:
+                st.error("Cannot load document: Q&A agent initialization failed")
+            else:
+                try:
+                    file_bytes = _read_uploaded_bytes(qa_file)
+                    doc_hash = hashlib.sha1(file_bytes).hexdigest()
+                    cached_doc = st.session_state.qa_doc_cache.get(doc_hash)
+                    if cached_doc is None:
+                        cached_doc = _load_cached_qa_doc(doc_hash)
+                        if cached_doc is not None:
+                            st.session_state.qa_doc_cache[doc_hash] = cached_doc
+
+                    if cached_doc is not None:
+                        # Identical file already ingested (this session or a
+                        # previous run): restore the chunked document instead
+                        # of re-extracting; the agent rebuilds per-document
+                        # state (suggested questions) alongside the chunks
+                        qa_agent.restore_document(cached_doc['document'],
+                                                  cached_doc['load_result'])
+                        result = cached_doc['load_result']
+                    else:
+                        # Load document (cached on content, so re-uploads are instant)
+                        result, document = _load_qa_document(file_bytes, qa_file.name, Config.AWS_PROFILE)
+                        if result['success']:
+                            # Re-install the snapshot: on a data-cache hit
+                            # the workflow didn't run and the shared agent
+                            # may still hold a different document
+                            qa_agent.restore_document(document, result)
+                            entry = {
+                                'load_result': result,
+                                'document': document
+                            }
+                            st.session_state.qa_doc_cache[doc_hash] = entry
+                            _store_cached_qa_doc(doc_hash, entry)
+
+                    # Display result
+                    display_qa_document_load_result(result)
+
+                    if result['success']:
+                        # Store document info in session state
+                        st.session_state.current_qa_document = {
+                            'file_name': qa_file.name,
+                            'file_path': result.get('file_path', ''),
+                            'doc_hash': doc_hash,
+                            'chunks_count': result['document_info'].get('chunks_count', 0),
+                            'text_length': result['document_info'].get('text_length', 0),
+                            'load_result': result
+                        }
+                        st.rerun()
+
+                except Exception as e:
+                    st.error(f"Document loading failed: {str(e)}")
+
+    # Q&A section (only show if document is loaded)
+    if st.session_state.current_qa_document:
+        st.markdown("---")
+        st.subheader("💬 Step 2: Ask Questions")
+
+        # Get Q&A agent
+        qa_agent = create_qa_agent()
+        if qa_agent:
+            # Suggested questions, memoized per document so they aren't
+            # recomputed on every rerun (reruns fire per keystroke below)
+            doc_hash = st.session_state.current_qa_document.get('doc_hash', '')
+            suggested_cache = st.session_state.setdefault('qa_suggested_cache', {})
+            suggested_questions = suggested_cache.get(doc_hash)
+            if suggested_questions is None:
+                suggested_questions = qa_agent.get_suggested_questions()
+                suggested_cache[doc_hash] = suggested_questions
+            if suggested_questions:
+                st.write("**💡 Suggested Questions:**")
+                cols = st.columns(2)
+                for i, suggestion in enumerate(suggested_questions):
+                    col_idx = i % 2
+                    with cols[col_idx]:
+                        if st.button(f"❓ {suggestion}", key=f"suggest_{i}"):
+                            st.session_state.current_question = suggestion
+
+            # Question input
+            question = st.text_input(
+                "Ask a question about the document:",
+                value=st.session_state.get('current_question', ''),
+                placeholder="e.g., What is the main topic of this document?",
+                key="qa_question_input"
+            )
+
+            # Clear current question after use
+            if 'current_question' in st.session_state:
+                del st.session_state.current_question
+
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                ask_button = st.button("🤖 Ask Question", type="primary", disabled=not question.strip())
+            with col2:
+                include_context = st.checkbox("Use Context", value=True, help="Include conversation history for better answers")
+            with col3:
+                if st.button("🗑️ Clear Chat"):
+                    st.session_state.qa_conversation = deque(maxlen=200)
+                    st.session_state.qa_success_count = 0
+                    qa_agent.clear_conversation()
+                    st.rerun()
+
+            # Process question
+            if ask_button and question.strip():
+                try:
+                    # Repeated questions on the same document (e.g. suggested
+                    # question clicks) hit the response cache instead of Bedrock
+                    doc_hash = st.session_state.current_qa_document.get('doc_hash', '')
+                    cache_key = (doc_hash, question.strip().lower(), include_context)
+                    qa_cache = st.session_state.qa_cache
+
+                    if cache_key in qa_cache:
+                        qa_cache.move_to_end(cache_key)
+                        result = qa_cache[cache_key]
+                    else:
+                        with st.spinner("Generating answer..."):
+                            result = qa_agent.ask_question_workflow(question, include_context=include_context)
+                        qa_cache[cache_key] = result
+                        if len(qa_cache) > 128:
+                            qa_cache.popitem(last=False)
+
+                    # Store in conversation
+                    _record_qa_exchange(question, result)
+
+                    # Display answer
+                    display_qa_answer(result)
+
+                except Exception as e:
+                    st.error(f"Question answering failed: {str(e)}")
+
+            # Conversation history
+            if st.session_state.qa_conversation:
+                st.markdown("---")
+                st.subheader("💬 Conversation History")
+
+                # Show recent conversations (last 5), newest first, without
+                # slicing a copy of the history on every rerun
+                n = len(st.session_state.qa_conversation)
+                shown = min(n, 5)
+
+                for i, idx in enumerate(range(n - 1, n - shown - 1, -1), 1):
+                    conv = st.session_state.qa_conversation[idx]
+                    with st.expander(f"Q{shown - i + 1}: {conv['question'][:50]}..."):
+                        display_qa_answer(conv['result'])
+
+                # Conversation statistics
+                if n > 5:
+                    st.info(f"Showing last 5 of {n} questions. Use 'Clear Chat' to reset.")
+
+    else:
+        st.info("👆 Please load a document first to start asking questions.")
+
+@st.fragment
+def _tab_batch():
+    st.header("Batch Document Processing")
+    st.info("Upload multiple documents for batch processing")
+
+    # Multiple file upload
+    uploaded_files = st.file_uploader(
+        "Choose multiple document files",
+        type=['pdf', 'png', 'jpg', 'jpeg', 'tiff'],
+        accept_multiple_files=True,
+        help="Select multiple files for batch processing"
+    )
+
+    if uploaded_files:
+        st.write(f"Selected {len(uploaded_files)} files for batch processing")
+
+        # Show file list
+        with st.expander("📁 Selected Files"):
+            for file in uploaded_files:
+                st.write(f"• {file.name} ({file.size / 1024 / 1024:.2f} MB)")
+
+        if st.button("🚀 Process Batch", type="primary"):
+            agent = create_agent()
+            if agent is None:
+                st.error("Cannot process documents: AI agent initialization failed")
+                return
+
+            try:
+                # Stream all files to disk, skipping byte-identical duplicates
+                file_paths = []
+                seen_hashes = set()
+                for uploaded_file in uploaded_files:
+                    file_path, file_hash = save_uploaded_file(uploaded_file)
+                    if file_hash in seen_hashes:
+                        os.remove(file_path)
+                        continue
+                    seen_hashes.add(file_hash)
+                    file_paths.append(file_path)
+
+                # Process batch
+                progress_bar = st.progress(0)
+                status_text = st.empty()
+
+                # Fan documents out across a thread pool; the workflow is
+                # Bedrock/IO-bound so workers overlap their waits
+                max_workers = int(os.environ.get(
+                    'BATCH_CONCURRENCY',
+                    min(len(file_paths), (os.cpu_count() or 1) * 2)
+                ))
+
+                results = []
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(agent.process_document_workflow, fp): fp
+                        for fp in file_paths
+                    }
+                    for i, future in enumerate(as_completed(futures)):
+                        status_text.text(f"Processed {i+1}/{len(file_paths)}: {os.path.basename(futures[future])}")
+                        progress_bar.progress((i + 1) / len(file_paths))
+                        results.append(future.result())
+
+                # Record into session state only after the pool drains so
+                # worker threads never touch Streamlit state
+                for result in results:
+                    _record_processing_result(result)
+
+                status_text.text("Batch processing completed!")
+
+                # Display batch statistics (cached per distinct result set so
+                # reruns don't re-aggregate)
+                stats = _compute_batch_stats(tuple(results), Config.AWS_PROFILE)
+
+                st.subheader("📊 Batch Processing Results")
+                col1, col2, col3, col4 = st.columns(4)
+
+                with col1:
+                    st.metric("Total Documents", stats['total_documents'])
+                with col2:
+                    st.metric("Successful", stats['successful_processing'])
+                with col3:
+                    st.metric("Failed", stats['failed_processing'])
+                with col4:
+                    st.metric("Success Rate", f"{stats['success_rate']:.1f}%")
+
+                # Document type distribution
+                if stats['document_type_distribution']:
+                    st.subheader("📋 Document Type Distribution")
+                    st.bar_chart(_type_distribution_df(
+                        tuple(stats['document_type_distribution'].items())
+                    ))
+
+                # Clean up files off the request thread so the rerun isn't
+                # blocked on filesystem latency
+                threading.Thread(target=_unlink_all, args=(file_paths,), daemon=True).start()
+
+            except Exception as e:
+                st.error(f"Batch processing failed: {str(e)}")
+
+@st.fragment
+def _tab_help():
+    st.header("Help & User Feedback")
+
+    # Help section
+    st.subheader("📖 How to Use")
+    st.write("""
+    1. **Single Document Processing**: Upload one document at a time for detailed processing
+    2. **Property Research**: Upload settlement documents for comprehensive property research with AI insights
+    3. **Document Q&A (NEW!)**: Upload any document and ask questions about its content using RAG
+    4. **Batch Processing**: Upload multiple documents for efficient bulk processing
+    5. **Supported Formats**: PDF, PNG, JPG, JPEG, TIFF
+    6. **Maximum File Size**: 50MB per document
+    7. **Maximum Pages**: 500 pages per PDF document
+    """)
+
+    st.subheader("🎯 Document Types")
+    st.write("""
+    The system can automatically classify and extract data from:
+    - **Settlement Documents**: Property sales, commissions, closing details
+    - **Purchase Agreements**: Purchase terms, buyer/seller information
+    - **Income Verification**: Employment and income details
+    """)
+
+    st.subheader("💬 Document Q&A Features")
+    st.write("""
+    Our new **Document Q&A with RAG** feature provides:
+    - **Smart Document Loading**: Processes and chunks documents for optimal retrieval
+    - **Natural Language Questions**: Ask questions in plain English about document content
+    - **Accurate Answers**: RAG-based responses with source citations and confidence scores
+    - **Conversation Context**: Maintains context across multiple questions
+    - **Suggested Questions**: AI-generated relevant questions based on document content
+    - **Source Attribution**: Shows which parts of the document were used to answer questions
+    - **Document Summaries**: Automatic generation of document overviews
+    """)
+
+    st.subheader("🔍 Property Research Features")
+    st.write("""
+    Our **Agentic AI Property Research** feature provides:
+    - **Document Processing**: Extracts property details from settlement documents
+    - **Web Research**: Searches multiple sources for current market data
+    - **Market Analysis**: Compares property value to market trends and comparable sales
+    - **Neighborhood Intelligence**: Walkability, transit scores, amenities, demographics
+    - **School Information**: Ratings, districts, and nearby schools
+    - **Safety Data**: Crime statistics and safety scores
+    - **AI Insights**: Investment analysis, risk assessment, and recommendations
+    - **Comprehensive Reports**: All data compiled into actionable insights
+    """)
+
+    st.subheader("🤖 AI Agent Capabilities")
+    st.write("""
+    The system uses **AWS Strands AI** with multiple specialized agents:
+    - **Document Agent**: Processes documents with Claude Sonnet on Amazon Bedrock
+    - **Property Research Agent**: Orchestrates comprehensive property analysis
+    - **Document Q&A Agent**: Provides intelligent question-answering with RAG
+    - **Web Search Tool**: Gathers real-time property and market information
+    - **RAG Tool**: Enables accurate document-based question answering
+    """)
+
+    # User feedback section
+    st.subheader("💬 User Feedback")
+    st.write("Help us improve the document processor by sharing your feedback!")
+
+    with st.form("feedback_form"):
+        # Additional document types
+        st.write("**What additional document types would you like to see supported?**")
+        additional_doc_types = st.text_area(
+            "Document Types",
+            placeholder="e.g., Loan applications, Property appraisals, Insurance documents..."
+        )
+
+        # Additional extraction fields
+        st.write("**What additional data fields would you like to extract?**")
+        additional_fields = st.text_area(
+            "Extraction Fields",
+            placeholder="e.g., Property tax information, HOA fees, Inspection details..."
+        )
+
+        # General feedback
+        st.write("**General feedback or suggestions:**")
+        general_feedback = st.text_area(
+            "Feedback",
+            placeholder="Share your experience, suggestions for improvement, or any issues you encountered..."
+        )
+
+        submitted = st.form_submit_button("📤 Submit Feedback")
+
+        if submitted:
+            # In a real application, you would save this feedback to a database
+            st.success("Thank you for your feedback! Your input helps us improve the system.")
+
+            # Display feedback summary
+            with st.expander("📋 Your Feedback Summary"):
+                if additional_doc_types:
+                    st.write(f"**Additional Document Types:** {additional_doc_types}")
+                if additional_fields:
+                    st.write(f"**Additional Fields:** {additional_fields}")
+                if general_feedback:
+                    st.write(f"**General Feedback:** {general_feedback}")
+
 def main():
     """Main application function"""
     initialize_session_state()
-    
+    _inject_css()
+
     # Header
     st.markdown('<h1 class="main-header">📄 Real Estate Document Processor with AI Agents</h1>', unsafe_allow_html=True)
     st.markdown('<div class="info-box">AI-powered document processing with Property Research and Document Q&A using AWS Strands AI</div>', unsafe_allow_html=True)
@@ -505,8 +1293,7 @@ def main():
         # Document type filter
         st.header("📋 Document Types")
         st.write("Supported document types:")
-        for doc_type in Config.DOCUMENT_TYPES:
-            st.write(f"• {doc_type.replace('_', ' ').title()}")
+        st.markdown(get_doctype_markdown())
         
         # Processing statistics
         if st.session_state.processing_results or st.session_state.research_results or st.session_state.qa_conversation:
@@ -515,7 +1302,7 @@ def main():
             # Document processing stats
             if st.session_state.processing_results:
                 total_processed = len(st.session_state.processing_results)
-                successful = sum(1 for r in st.session_state.processing_results if r['success'])
+                successful = st.session_state.processing_success_count
                 st.subheader("Document Processing")
                 st.metric("Documents Processed", total_processed)
                 st.metric("Success Rate", f"{(successful/total_processed*100):.1f}%")
@@ -523,7 +1310,7 @@ def main():
             # Property research stats
             if st.session_state.research_results:
                 total_researched = len(st.session_state.research_results)
-                successful_research = sum(1 for r in st.session_state.research_results if r['success'])
+                successful_research = st.session_state.research_success_count
                 st.subheader("Property Research")
                 st.metric("Properties Researched", total_researched)
                 st.metric("Research Success Rate", f"{(successful_research/total_researched*100):.1f}%")
@@ -531,7 +1318,7 @@ def main():
             # Q&A stats
             if st.session_state.qa_conversation:
                 total_questions = len(st.session_state.qa_conversation)
-                successful_qa = sum(1 for q in st.session_state.qa_conversation if q['result']['success'])
+                successful_qa = st.session_state.qa_success_count
                 st.subheader("Document Q&A")
                 st.metric("Questions Asked", total_questions)
                 st.metric("Q&A Success Rate", f"{(successful_qa/total_questions*100):.1f}%")
@@ -541,548 +1328,21 @@ def main():
     
     # Main content
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["📤 Upload & Process", "🔍 Property Research", "💬 Document Q&A", "📊 Batch Processing", "❓ Help & Feedback"])
-    
+
     with tab1:
-        st.header("Single Document Processing")
-        
-        # File upload
-        uploaded_file = st.file_uploader(
-            "Choose a document file",
-            type=['pdf', 'png', 'jpg', 'jpeg', 'tiff'],
-            help=f"Supported formats: {', '.join(Config.SUPPORTED_FORMATS)}"
-        )
-        
-        if uploaded_file is not None:
-            # Display file info
-            st.write(f"**File:** {uploaded_file.name}")
-            st.write(f"**Size:** {uploaded_file.size / 1024 / 1024:.2f} MB")
-            
-            # Process button
-            if st.button("🚀 Process Document", type="primary"):
-                agent = create_agent()
-                if agent is None:
-                    st.error("Cannot process document: AI agent initialization failed")
-                    return
-                
-                try:
-                    # Save uploaded file
-                    file_path = save_uploaded_file(uploaded_file)
-                    
-                    # Process document
-                    with st.spinner("Processing document... This may take a few moments."):
-                        start_time = time.time()
-                        result = agent.process_document_workflow(file_path)
-                        processing_time = time.time() - start_time
-                        
-                        # Add processing time to result
-                        if result['success']:
-                            result['final_result']['processing_time_seconds'] = processing_time
-                    
-                    # Store result
-                    st.session_state.processing_results.append(result)
-                    
-                    # Display result
-                    display_processing_result(result)
-                    
-                    # Clean up uploaded file
-                    try:
-                        os.remove(file_path)
-                    except:
-                        pass
-                        
-                except Exception as e:
-                    st.error(f"Processing failed: {str(e)}")
-    
+        _tab_upload()
+
     with tab2:
-        st.header("🔍 Property Research with Agentic AI")
-        st.markdown("""
-        <div class="info-box">
-        <strong>🤖 Agentic AI Property Research</strong><br>
-        Upload a settlement document and our AI agent will:
-        <ul>
-        <li>📄 Process and extract property details from the document</li>
-        <li>🌐 Search the web for current market information</li>
-        <li>📊 Analyze market trends and comparable properties</li>
-        <li>🏘️ Research neighborhood information and amenities</li>
-        <li>🎓 Find school ratings and district information</li>
-        <li>🚔 Provide safety and crime statistics</li>
-        <li>💡 Generate AI-powered investment insights and recommendations</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # File upload for property research
-        research_file = st.file_uploader(
-            "Upload Settlement Document for Property Research",
-            type=['pdf', 'png', 'jpg', 'jpeg', 'tiff'],
-            help="Upload a settlement document to research the property",
-            key="research_uploader"
-        )
-        
-        if research_file is not None:
-            # Display file info
-            st.write(f"**File:** {research_file.name}")
-            st.write(f"**Size:** {research_file.size / 1024 / 1024:.2f} MB")
-            
-            # Research options
-            st.subheader("🔧 Research Options")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                include_market_analysis = st.checkbox("Include Market Analysis", value=True)
-                include_neighborhood_info = st.checkbox("Include Neighborhood Information", value=True)
-                include_school_info = st.checkbox("Include School Information", value=True)
-            
-            with col2:
-                include_crime_stats = st.checkbox("Include Crime Statistics", value=True)
-                include_ai_insights = st.checkbox("Generate AI Insights", value=True)
-                include_investment_analysis = st.checkbox("Include Investment Analysis", value=True)
-            
-            # Process button
-            if st.button("🚀 Start Property Research", type="primary", key="research_button"):
-                research_agent = create_research_agent()
-                if research_agent is None:
-                    st.error("Cannot start property research: AI agent initialization failed")
-                    return
-                
-                try:
-                    # Save uploaded file
-                    file_path = save_uploaded_file(research_file)
-                    
-                    # Show agent capabilities
-                    with st.expander("🤖 Agent Capabilities"):
-                        capabilities = research_agent.get_agent_capabilities()
-                        st.write(f"**Agent Name:** {capabilities['name']}")
-                        st.write(f"**Description:** {capabilities['description']}")
-                        st.write("**Capabilities:**")
-                        for capability in capabilities['capabilities']:
-                            st.write(f"• {capability}")
-                    
-                    # Process with progress tracking
-                    progress_container = st.container()
-                    with progress_container:
-                        st.write("🔄 **Processing Status:**")
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        # Step-by-step progress updates
-                        status_text.text("🔍 Step 1/5: Processing settlement document...")
-                        progress_bar.progress(20)
-                        time.sleep(1)  # Brief pause for UI update
-                        
-                        status_text.text("📍 Step 2/5: Extracting property information...")
-                        progress_bar.progress(40)
-                        
-                        status_text.text("🌐 Step 3/5: Searching web for property data...")
-                        progress_bar.progress(60)
-                        
-                        status_text.text("🤖 Step 4/5: Generating AI insights...")
-                        progress_bar.progress(80)
-                        
-                        status_text.text("📊 Step 5/5: Compiling comprehensive report...")
-                        progress_bar.progress(100)
-                        
-                        # Perform actual research
-                        start_time = time.time()
-                        result = research_agent.research_property_workflow(file_path)
-                        processing_time = time.time() - start_time
-                        
-                        status_text.text(f"✅ Research completed in {processing_time:.2f} seconds!")
-                    
-                    # Store result
-                    st.session_state.research_results.append(result)
-                    
-                    # Display comprehensive results
-                    st.markdown("---")
-                    display_property_research_result(result)
-                    
-                    # Clean up uploaded file
-                    try:
-                        os.remove(file_path)
-                    except:
-                        pass
-                        
-                except Exception as e:
-                    st.error(f"Property research failed: {str(e)}")
-                    import traceback
-                    st.error(f"Detailed error: {traceback.format_exc()}")
-        
-        # Research History
-        if st.session_state.research_results:
-            st.markdown("---")
-            st.subheader("📚 Research History")
-            
-            # Summary statistics
-            total_researched = len(st.session_state.research_results)
-            successful_research = sum(1 for r in st.session_state.research_results if r['success'])
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Properties Researched", total_researched)
-            with col2:
-                st.metric("Successful Research", successful_research)
-            with col3:
-                success_rate = (successful_research / total_researched * 100) if total_researched > 0 else 0
-                st.metric("Success Rate", f"{success_rate:.1f}%")
-            
-            # Recent research results
-            with st.expander("📋 Recent Research Results"):
-                for i, result in enumerate(reversed(st.session_state.research_results[-5:]), 1):
-                    if result['success']:
-                        report = result.get('comprehensive_report', {})
-                        property_summary = report.get('property_summary', {})
-                        st.write(f"**{i}.** {property_summary.get('address', 'Unknown Address')} - "
-                                f"${property_summary.get('sale_price', 0):,} "
-                                f"({property_summary.get('closing_date', 'Unknown Date')})")
-                    else:
-                        st.write(f"**{i}.** Research failed: {result.get('error', 'Unknown error')}")
-    
+        _tab_research()
+
     with tab3:
-        st.header("💬 Document Q&A with RAG")
-        st.markdown("""
-        <div class="info-box">
-        <strong>🤖 Intelligent Document Q&A</strong><br>
-        Upload any document and ask questions about its content using RAG (Retrieval-Augmented Generation):
-        <ul>
-        <li>📄 Load and process documents (PDF, images)</li>
-        <li>🔍 Intelligent text chunking and retrieval</li>
-        <li>💬 Ask natural language questions</li>
-        <li>🎯 Get accurate answers with source citations</li>
-        <li>📚 Maintain conversation context</li>
-        <li>📋 Generate document summaries</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Document loading section
-        st.subheader("📄 Step 1: Load Document")
-        
-        # Check if document is already loaded
-        if st.session_state.current_qa_document:
-            st.success(f"✅ Document loaded: {st.session_state.current_qa_document.get('file_name', 'Unknown')}")
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"**Chunks:** {st.session_state.current_qa_document.get('chunks_count', 0)}")
-                st.write(f"**Text Length:** {st.session_state.current_qa_document.get('text_length', 0):,} characters")
-            with col2:
-                if st.button("🗑️ Clear Document", key="clear_qa_doc"):
-                    st.session_state.current_qa_document = None
-                    st.session_state.qa_conversation = []
-                    qa_agent = st.session_state.get('qa_agent')
-                    if qa_agent:
-                        qa_agent.rag_tool.clear_document()
-                        qa_agent.clear_conversation()
-                    st.rerun()
-        
-        # File upload for Q&A
-        qa_file = st.file_uploader(
-            "Upload Document for Q&A",
-            type=['pdf', 'png', 'jpg', 'jpeg', 'tiff'],
-            help="Upload any document to ask questions about its content",
-            key="qa_uploader"
-        )
-        
-        if qa_file is not None and not st.session_state.current_qa_document:
-            st.write(f"**File:** {qa_file.name}")
-            st.write(f"**Size:** {qa_file.size / 1024 / 1024:.2f} MB")
-            
-            if st.button("📚 Load Document for Q&A", type="primary", key="load_qa_doc"):
-                qa_agent = create_qa_agent()
-                if qa_agent is None:
-                    st.error("Cannot load document: Q&A agent initialization failed")
-                else:
-                    try:
-                        # Save uploaded file
-                        file_path = save_uploaded_file(qa_file)
-                        
-                        # Load document
-                        with st.spinner("Loading document for Q&A..."):
-                            result = qa_agent.load_document_workflow(file_path)
-                        
-                        # Display result
-                        display_qa_document_load_result(result)
-                        
-                        if result['success']:
-                            # Store document info in session state
-                            st.session_state.current_qa_document = {
-                                'file_name': qa_file.name,
-                                'file_path': file_path,
-                                'chunks_count': result['document_info'].get('chunks_count', 0),
-                                'text_length': result['document_info'].get('text_length', 0),
-                                'load_result': result
-                            }
-                            st.rerun()
-                        
-                        # Clean up uploaded file
-                        try:
-                            os.remove(file_path)
-                        except:
-                            pass
-                            
-                    except Exception as e:
-                        st.error(f"Document loading failed: {str(e)}")
-        
-        # Q&A section (only show if document is loaded)
-        if st.session_state.current_qa_document:
-            st.markdown("---")
-            st.subheader("💬 Step 2: Ask Questions")
-            
-            # Get Q&A agent
-            qa_agent = st.session_state.get('qa_agent')
-            if qa_agent:
-                # Suggested questions
-                suggested_questions = qa_agent.get_suggested_questions()
-                if suggested_questions:
-                    st.write("**💡 Suggested Questions:**")
-                    cols = st.columns(2)
-                    for i, suggestion in enumerate(suggested_questions):
-                        col_idx = i % 2
-                        with cols[col_idx]:
-                            if st.button(f"❓ {suggestion}", key=f"suggest_{i}"):
-                                st.session_state.current_question = suggestion
-                
-                # Question input
-                question = st.text_input(
-                    "Ask a question about the document:",
-                    value=st.session_state.get('current_question', ''),
-                    placeholder="e.g., What is the main topic of this document?",
-                    key="qa_question_input"
-                )
-                
-                # Clear current question after use
-                if 'current_question' in st.session_state:
-                    del st.session_state.current_question
-                
-                col1, col2, col3 = st.columns([2, 1, 1])
-                with col1:
-                    ask_button = st.button("🤖 Ask Question", type="primary", disabled=not question.strip())
-                with col2:
-                    include_context = st.checkbox("Use Context", value=True, help="Include conversation history for better answers")
-                with col3:
-                    if st.button("🗑️ Clear Chat"):
-                        st.session_state.qa_conversation = []
-                        qa_agent.clear_conversation()
-                        st.rerun()
-                
-                # Process question
-                if ask_button and question.strip():
-                    try:
-                        with st.spinner("Generating answer..."):
-                            result = qa_agent.ask_question_workflow(question, include_context=include_context)
-                        
-                        # Store in conversation
-                        st.session_state.qa_conversation.append({
-                            'question': question,
-                            'result': result,
-                            'timestamp': time.time()
-                        })
-                        
-                        # Display answer
-                        display_qa_answer(result)
-                        
-                    except Exception as e:
-                        st.error(f"Question answering failed: {str(e)}")
-                
-                # Conversation history
-                if st.session_state.qa_conversation:
-                    st.markdown("---")
-                    st.subheader("💬 Conversation History")
-                    
-                    # Show recent conversations (last 5)
-                    recent_conversations = st.session_state.qa_conversation[-5:]
-                    
-                    for i, conv in enumerate(reversed(recent_conversations), 1):
-                        with st.expander(f"Q{len(recent_conversations)-i+1}: {conv['question'][:50]}..."):
-                            display_qa_answer(conv['result'])
-                    
-                    # Conversation statistics
-                    if len(st.session_state.qa_conversation) > 5:
-                        st.info(f"Showing last 5 of {len(st.session_state.qa_conversation)} questions. Use 'Clear Chat' to reset.")
-        
-        else:
-            st.info("👆 Please load a document first to start asking questions.")
-    
+        _tab_qa()
+
     with tab4:
-        st.header("Batch Document Processing")
-        st.info("Upload multiple documents for batch processing")
-        
-        # Multiple file upload
-        uploaded_files = st.file_uploader(
-            "Choose multiple document files",
-            type=['pdf', 'png', 'jpg', 'jpeg', 'tiff'],
-            accept_multiple_files=True,
-            help="Select multiple files for batch processing"
-        )
-        
-        if uploaded_files:
-            st.write(f"Selected {len(uploaded_files)} files for batch processing")
-            
-            # Show file list
-            with st.expander("📁 Selected Files"):
-                for file in uploaded_files:
-                    st.write(f"• {file.name} ({file.size / 1024 / 1024:.2f} MB)")
-            
-            if st.button("🚀 Process Batch", type="primary"):
-                agent = create_agent()
-                if agent is None:
-                    st.error("Cannot process documents: AI agent initialization failed")
-                    return
-                
-                try:
-                    # Save all files
-                    file_paths = []
-                    for uploaded_file in uploaded_files:
-                        file_path = save_uploaded_file(uploaded_file)
-                        file_paths.append(file_path)
-                    
-                    # Process batch
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    
-                    results = []
-                    for i, file_path in enumerate(file_paths):
-                        status_text.text(f"Processing {i+1}/{len(file_paths)}: {os.path.basename(file_path)}")
-                        progress_bar.progress((i + 1) / len(file_paths))
-                        
-                        result = agent.process_document_workflow(file_path)
-                        results.append(result)
-                        st.session_state.processing_results.append(result)
-                    
-                    status_text.text("Batch processing completed!")
-                    
-                    # Display batch statistics
-                    stats = agent.get_processing_statistics(results)
-                    
-                    st.subheader("📊 Batch Processing Results")
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Total Documents", stats['total_documents'])
-                    with col2:
-                        st.metric("Successful", stats['successful_processing'])
-                    with col3:
-                        st.metric("Failed", stats['failed_processing'])
-                    with col4:
-                        st.metric("Success Rate", f"{stats['success_rate']:.1f}%")
-                    
-                    # Document type distribution
-                    if stats['document_type_distribution']:
-                        st.subheader("📋 Document Type Distribution")
-                        type_df = pd.DataFrame(
-                            list(stats['document_type_distribution'].items()),
-                            columns=['Document Type', 'Count']
-                        )
-                        st.bar_chart(type_df.set_index('Document Type'))
-                    
-                    # Clean up files
-                    for file_path in file_paths:
-                        try:
-                            os.remove(file_path)
-                        except:
-                            pass
-                            
-                except Exception as e:
-                    st.error(f"Batch processing failed: {str(e)}")
-    
+        _tab_batch()
+
     with tab5:
-        st.header("Help & User Feedback")
-        
-        # Help section
-        st.subheader("📖 How to Use")
-        st.write("""
-        1. **Single Document Processing**: Upload one document at a time for detailed processing
-        2. **Property Research**: Upload settlement documents for comprehensive property research with AI insights
-        3. **Document Q&A (NEW!)**: Upload any document and ask questions about its content using RAG
-        4. **Batch Processing**: Upload multiple documents for efficient bulk processing
-        5. **Supported Formats**: PDF, PNG, JPG, JPEG, TIFF
-        6. **Maximum File Size**: 50MB per document
-        7. **Maximum Pages**: 500 pages per PDF document
-        """)
-        
-        st.subheader("🎯 Document Types")
-        st.write("""
-        The system can automatically classify and extract data from:
-        - **Settlement Documents**: Property sales, commissions, closing details
-        - **Purchase Agreements**: Purchase terms, buyer/seller information
-        - **Income Verification**: Employment and income details
-        """)
-        
-        st.subheader("💬 Document Q&A Features")
-        st.write("""
-        Our new **Document Q&A with RAG** feature provides:
-        - **Smart Document Loading**: Processes and chunks documents for optimal retrieval
-        - **Natural Language Questions**: Ask questions in plain English about document content
-        - **Accurate Answers**: RAG-based responses with source citations and confidence scores
-        - **Conversation Context**: Maintains context across multiple questions
-        - **Suggested Questions**: AI-generated relevant questions based on document content
-        - **Source Attribution**: Shows which parts of the document were used to answer questions
-        - **Document Summaries**: Automatic generation of document overviews
-        """)
-        
-        st.subheader("🔍 Property Research Features")
-        st.write("""
-        Our **Agentic AI Property Research** feature provides:
-        - **Document Processing**: Extracts property details from settlement documents
-        - **Web Research**: Searches multiple sources for current market data
-        - **Market Analysis**: Compares property value to market trends and comparable sales
-        - **Neighborhood Intelligence**: Walkability, transit scores, amenities, demographics
-        - **School Information**: Ratings, districts, and nearby schools
-        - **Safety Data**: Crime statistics and safety scores
-        - **AI Insights**: Investment analysis, risk assessment, and recommendations
-        - **Comprehensive Reports**: All data compiled into actionable insights
-        """)
-        
-        st.subheader("🤖 AI Agent Capabilities")
-        st.write("""
-        The system uses **AWS Strands AI** with multiple specialized agents:
-        - **Document Agent**: Processes documents with Claude Sonnet on Amazon Bedrock
-        - **Property Research Agent**: Orchestrates comprehensive property analysis
-        - **Document Q&A Agent**: Provides intelligent question-answering with RAG
-        - **Web Search Tool**: Gathers real-time property and market information
-        - **RAG Tool**: Enables accurate document-based question answering
-        """)
-        
-        # User feedback section
-        st.subheader("💬 User Feedback")
-        st.write("Help us improve the document processor by sharing your feedback!")
-        
-        with st.form("feedback_form"):
-            # Additional document types
-            st.write("**What additional document types would you like to see supported?**")
-            additional_doc_types = st.text_area(
-                "Document Types",
-                placeholder="e.g., Loan applications, Property appraisals, Insurance documents..."
-            )
-            
-            # Additional extraction fields
-            st.write("**What additional data fields would you like to extract?**")
-            additional_fields = st.text_area(
-                "Extraction Fields",
-                placeholder="e.g., Property tax information, HOA fees, Inspection details..."
-            )
-            
-            # General feedback
-            st.write("**General feedback or suggestions:**")
-            general_feedback = st.text_area(
-                "Feedback",
-                placeholder="Share your experience, suggestions for improvement, or any issues you encountered..."
-            )
-            
-            submitted = st.form_submit_button("📤 Submit Feedback")
-            
-            if submitted:
-                # In a real application, you would save this feedback to a database
-                st.success("Thank you for your feedback! Your input helps us improve the system.")
-                
-                # Display feedback summary
-                with st.expander("📋 Your Feedback Summary"):
-                    if additional_doc_types:
-                        st.write(f"**Additional Document Types:** {additional_doc_types}")
-                    if additional_fields:
-                        st.write(f"**Additional Fields:** {additional_fields}")
-                    if general_feedback:
-                        st.write(f"**General Feedback:** {general_feedback}")
+        _tab_help()
 
 if __name__ == "__main__":
     main()
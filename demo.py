@@ -8,12 +8,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.config import Config
-from src.models.bedrock_model import BedrockModel
-from src.tools.document_processor import DocumentProcessor
-
 def test_configuration():
     """Test configuration loading"""
+    from src.config import Config
+
     print("🔧 Testing Configuration...")
     print(f"   AWS Region: {Config.AWS_REGION}")
     print(f"   AWS Profile: {Config.AWS_PROFILE}")
@@ -25,6 +23,8 @@ def test_configuration():
 
 def test_document_processor():
     """Test document processor initialization"""
+    from src.tools.document_processor import DocumentProcessor
+
     print("📄 Testing Document Processor...")
     try:
         processor = DocumentProcessor()
@@ -44,6 +44,8 @@ def test_document_processor():
 
 def test_bedrock_model():
     """Test Bedrock model initialization"""
+    from src.models.bedrock_model import BedrockModel
+
     print("🤖 Testing Bedrock Model...")
     try:
         model = BedrockModel()
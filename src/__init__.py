@@ -1 +1,20 @@
 # StrandsDocumentProcessor package
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Workflow status logging: workers enqueue records in O(1) and a single
+# background thread does the actual stdout writes, so concurrent batch
+# workflows never serialize on terminal I/O
+_log_queue: 'queue.Queue' = queue.Queue(-1)
+_listener = QueueListener(_log_queue, logging.StreamHandler())
+_listener.start()
+atexit.register(_listener.stop)
+
+_root = logging.getLogger(__name__)
+if not _root.handlers:
+    _root.addHandler(QueueHandler(_log_queue))
+    _root.setLevel(logging.INFO)
+    _root.propagate = False
@@ -1,11 +1,47 @@
 """
 Document Q&A Agent using RAG (Retrieval-Augmented Generation)
 """
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
+import logging
 import time
+from collections import deque
+from functools import cached_property
+from itertools import islice
 from src.tools.rag_tool import DocumentRAGTool
 from src.config import Config
 
+logger = logging.getLogger(__name__)
+
+# Stable wrapper for context-enhanced questions; a constant template keeps the
+# prompt prefix byte-identical across turns so model-side caching can reuse it
+_CONTEXT_TEMPLATE = (
+    "Given this conversation context:\n"
+    "{context}\n\n"
+    "Current question: {question}\n\n"
+    "Please answer the current question, taking into account the conversation context if relevant."
+)
+
+# Character budget for the context block; oldest turns are dropped first
+_CONTEXT_CHAR_BUDGET = 2000
+
+# Exchanges kept in the conversation history; older ones age out automatically
+_HISTORY_MAXLEN = 20
+
+# Baseline suggested questions for real estate documents; built once at import
+# instead of on every get_suggested_questions call
+_BASE_SUGGESTIONS = (
+    "What is the property address?",
+    "What is the sale price?",
+    "Who are the buyer and seller?",
+    "When is the closing date?",
+    "What is the commission amount?",
+    "Are there any contingencies mentioned?",
+    "What are the key terms of this agreement?",
+    "What fees are mentioned in the document?",
+    "Are there any special conditions?",
+    "What is the earnest money amount?"
+)
+
 class DocumentQAAgent:
     """
     Agent for document question-answering using RAG approach
@@ -18,7 +54,7 @@ class DocumentQAAgent:
         Args:
             aws_profile: AWS profile name for authentication
         """
-        self.rag_tool = DocumentRAGTool(aws_profile=aws_profile)
+        self.aws_profile = aws_profile
         self.name = "DocumentQAAgent"
         self.description = "AI agent for answering questions about documents using RAG"
         self.capabilities = [
@@ -29,16 +65,28 @@ class DocumentQAAgent:
             "Multi-turn conversations about documents"
         ]
         
-        # Conversation history
-        self.conversation_history = []
+        # Conversation history; the deque evicts the oldest exchange itself
+        # once maxlen is reached, so no manual trimming is needed
+        self.conversation_history = deque(maxlen=_HISTORY_MAXLEN)
+
+        # Suggested questions computed once per loaded document
+        self._suggested_questions = []
+
+    @cached_property
+    def rag_tool(self) -> DocumentRAGTool:
+        """RAG tool (and its Bedrock client), built lazily on first use"""
+        return DocumentRAGTool(aws_profile=self.aws_profile)
     
-    def load_document_workflow(self, file_path: str) -> Dict[str, Any]:
+    def load_document_workflow(self, file_path: str,
+                               progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Complete workflow for loading a document for Q&A
-        
+
         Args:
             file_path: Path to the document file
-            
+            progress_callback: Optional callable receiving (step_name, info)
+                as each step starts or finishes
+
         Returns:
             Loading result with document information
         """
@@ -52,12 +100,15 @@ class DocumentQAAgent:
             'error': None,
             'processing_time': 0
         }
-        
-        start_time = time.time()
-        
+
+        # perf_counter is monotonic and meant for durations; time.time stays
+        # only where a wall-clock timestamp is recorded
+        start_time = time.perf_counter()
+
         try:
             # Step 1: Load and process document
-            print("📄 Step 1: Loading and processing document...")
+            if progress_callback:
+                progress_callback('document_loading', {'message': 'Loading and processing document...'})
             load_result = self.rag_tool.load_document(file_path)
             workflow_result['workflow_steps'].append({
                 'step': 'document_loading',
@@ -72,7 +123,8 @@ class DocumentQAAgent:
             workflow_result['document_info'] = load_result
             
             # Step 2: Generate document summary
-            print("📋 Step 2: Generating document summary...")
+            if progress_callback:
+                progress_callback('document_summary', {'message': 'Generating document summary...'})
             summary_result = self.rag_tool.get_document_summary()
             workflow_result['workflow_steps'].append({
                 'step': 'document_summary',
@@ -83,28 +135,41 @@ class DocumentQAAgent:
             workflow_result['document_summary'] = summary_result
             
             # Clear conversation history for new document
-            self.conversation_history = []
-            
+            self.conversation_history.clear()
+
+            # Precompute suggested questions while the load result is at hand,
+            # so later calls are a plain attribute read
+            self._suggested_questions = self._build_suggested_questions(load_result)
+
+
             workflow_result['success'] = True
-            print("✅ Document loaded successfully and ready for Q&A!")
-            
+            if progress_callback:
+                progress_callback('completed', {'result': workflow_result})
+
         except Exception as e:
             workflow_result['error'] = f"Workflow failed: {str(e)}"
-            print(f"❌ Workflow error: {str(e)}")
-        
+            if progress_callback:
+                progress_callback('error', {'message': workflow_result['error']})
+
         finally:
-            workflow_result['processing_time'] = time.time() - start_time
-        
+            workflow_result['processing_time'] = time.perf_counter() - start_time
+
         return workflow_result
-    
-    def ask_question_workflow(self, question: str, include_context: bool = True) -> Dict[str, Any]:
+
+    def ask_question_workflow(self, question: str, include_context: bool = True,
+                              stream_callback=None,
+                              progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Complete workflow for answering a question about the loaded document
-        
+
         Args:
             question: User's question
             include_context: Whether to include conversation context
-            
+            stream_callback: Optional callable receiving partial answer text
+                as it streams from the model
+            progress_callback: Optional callable receiving (step_name, info)
+                as each step starts or finishes
+
         Returns:
             Answer result with context and confidence
         """
@@ -118,9 +183,9 @@ class DocumentQAAgent:
             'error': None,
             'processing_time': 0
         }
-        
-        start_time = time.time()
-        
+
+        start_time = time.perf_counter()
+
         try:
             # Check if document is loaded
             doc_info = self.rag_tool.get_document_info()
@@ -129,14 +194,17 @@ class DocumentQAAgent:
                 return workflow_result
             
             # Step 1: Process question and retrieve relevant context
-            print(f"🔍 Step 1: Processing question: '{question}'")
-            
+            if progress_callback:
+                progress_callback('question_processing', {'message': f"Processing question: '{question}'"})
+
             # Enhance question with conversation context if requested
             enhanced_question = self._enhance_question_with_context(question) if include_context else question
-            
+
             # Step 2: Answer the question using RAG
-            print("🤖 Step 2: Generating answer using RAG...")
-            answer_result = self.rag_tool.ask_question(enhanced_question)
+            if progress_callback:
+                progress_callback('question_answering', {'message': 'Generating answer using RAG...'})
+            answer_result = self.rag_tool.ask_question(enhanced_question,
+                                                       stream_callback=stream_callback)
             workflow_result['workflow_steps'].append({
                 'step': 'question_answering',
                 'status': 'completed' if answer_result['success'] else 'failed',
@@ -151,51 +219,130 @@ class DocumentQAAgent:
             
             # Step 3: Update conversation history
             self._update_conversation_history(question, answer_result['answer'])
-            workflow_result['conversation_context'] = self.conversation_history[-5:]  # Last 5 exchanges
+            workflow_result['conversation_context'] = self._recent_history(5)  # Last 5 exchanges
             
             workflow_result['success'] = True
-            print("✅ Question answered successfully!")
-            
+            if progress_callback:
+                progress_callback('completed', {'result': workflow_result})
+
         except Exception as e:
             workflow_result['error'] = f"Workflow failed: {str(e)}"
-            print(f"❌ Workflow error: {str(e)}")
-        
+            if progress_callback:
+                progress_callback('error', {'message': workflow_result['error']})
+
         finally:
-            workflow_result['processing_time'] = time.time() - start_time
-        
+            workflow_result['processing_time'] = time.perf_counter() - start_time
+
         return workflow_result
-    
-    def get_suggested_questions(self) -> List[str]:
+
+    def ask_questions_workflow(self, questions: List[str]) -> List[Dict[str, Any]]:
         """
-        Generate suggested questions based on the loaded document
-        
+        Answer several questions about the loaded document in one batched call
+
+        Retrieval runs once over the union of the questions and all answers
+        come from a single Bedrock invocation, so asking K questions (e.g.
+        "ask all" over the suggestions) costs one round trip instead of K.
+
+        Args:
+            questions: User's questions
+
         Returns:
-            List of suggested questions
+            List of per-question results in the same shape as
+            ask_question_workflow
         """
+        start_time = time.perf_counter()
+
         doc_info = self.rag_tool.get_document_info()
         if not doc_info['loaded']:
-            return []
-        
-        # Basic suggested questions for real estate documents
-        suggestions = [
-            "What is the property address?",
-            "What is the sale price?",
-            "Who are the buyer and seller?",
-            "When is the closing date?",
-            "What is the commission amount?",
-            "Are there any contingencies mentioned?",
-            "What are the key terms of this agreement?",
-            "What fees are mentioned in the document?",
-            "Are there any special conditions?",
-            "What is the earnest money amount?"
-        ]
-        
+            return [{
+                'question': question,
+                'agent_name': self.name,
+                'workflow_steps': [],
+                'answer_result': {},
+                'conversation_context': [],
+                'success': False,
+                'error': "No document loaded. Please load a document first.",
+                'processing_time': 0
+            } for question in questions]
+
+        logger.info("🔍 Answering %d questions in one batched call...", len(questions))
+        answer_results = self.rag_tool.ask_questions(questions)
+        elapsed = time.perf_counter() - start_time
+
+        workflow_results = []
+        for question, answer_result in zip(questions, answer_results):
+            workflow_result = {
+                'question': question,
+                'agent_name': self.name,
+                'workflow_steps': [{
+                    'step': 'question_answering',
+                    'status': 'completed' if answer_result['success'] else 'failed',
+                    'result': answer_result
+                }],
+                'answer_result': answer_result,
+                'conversation_context': [],
+                'success': answer_result['success'],
+                'error': None if answer_result['success'] else answer_result.get('error'),
+                'processing_time': elapsed
+            }
+            if answer_result['success']:
+                self._update_conversation_history(question, answer_result['answer'])
+                workflow_result['conversation_context'] = self._recent_history(5)
+            workflow_results.append(workflow_result)
+
+        return workflow_results
+
+    def restore_document(self, document: Dict[str, Any],
+                         load_result: Dict[str, Any]) -> None:
+        """
+        Re-install a cached document and rebuild its derived state
+
+        Mirrors the tail of load_document_workflow for documents restored
+        from a content-hash cache: the conversation history is reset and
+        the suggested questions are rebuilt for the restored document.
+
+        Args:
+            document: Snapshot of the RAG tool's current_document captured
+                after a successful load
+            load_result: The workflow result returned by
+                load_document_workflow for that load
+        """
+        self.rag_tool.restore_document(document)
+        self.conversation_history.clear()
+        self._suggested_questions = self._build_suggested_questions(
+            load_result.get('document_info', {})
+        )
+
+    def get_suggested_questions(self) -> List[str]:
+        """
+        Get suggested questions for the loaded document
+
+        Suggestions are precomputed in load_document_workflow; this just
+        returns the stored list.
+
+        Returns:
+            List of suggested questions
+        """
+        return list(self._suggested_questions)
+
+    def _build_suggested_questions(self, load_result: Dict[str, Any]) -> List[str]:
+        """
+        Build the suggested-question list for a freshly loaded document
+
+        Args:
+            load_result: Result dict from DocumentRAGTool.load_document
+
+        Returns:
+            List of up to 8 suggested questions
+        """
+        suggestions = list(_BASE_SUGGESTIONS)
+
         # Add document-specific suggestions based on metadata
-        metadata = doc_info.get('metadata', {})
+        metadata = load_result.get('metadata', {})
         if metadata.get('pages', 0) > 10:
             suggestions.append("Can you summarize the main sections of this document?")
-        
-        return suggestions[:8]  # Return top 8 suggestions
+
+        return suggestions[:8]  # Keep top 8 suggestions
     
     def get_conversation_summary(self) -> Dict[str, Any]:
         """
@@ -206,14 +353,29 @@ class DocumentQAAgent:
         """
         return {
             'total_questions': len(self.conversation_history),
-            'recent_questions': [item['question'] for item in self.conversation_history[-3:]],
+            'recent_questions': [item['question'] for item in self._recent_history(3)],
             'document_loaded': self.rag_tool.get_document_info()['loaded'],
-            'conversation_history': self.conversation_history
+            'conversation_history': list(self.conversation_history)
         }
     
     def clear_conversation(self):
         """Clear the conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        if not self.rag_tool.get_document_info()['loaded']:
+            self._suggested_questions = []
+
+    def _recent_history(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Get the last `count` exchanges without copying the whole deque
+
+        Args:
+            count: Maximum number of exchanges to return
+
+        Returns:
+            List of the most recent exchanges, oldest first
+        """
+        start = max(0, len(self.conversation_history) - count)
+        return list(islice(self.conversation_history, start, None))
     
     def _enhance_question_with_context(self, question: str) -> str:
         """
@@ -227,28 +389,21 @@ class DocumentQAAgent:
         """
         if not self.conversation_history:
             return question
-        
-        # Get recent conversation context
-        recent_context = self.conversation_history[-2:]  # Last 2 exchanges
-        
-        if recent_context:
-            context_str = "\n".join([
-                f"Previous Q: {item['question']}\nPrevious A: {item['answer'][:200]}..."
-                for item in recent_context
-            ])
-            
-            enhanced_question = f"""
-            Given this conversation context:
-            {context_str}
-            
-            Current question: {question}
-            
-            Please answer the current question, taking into account the conversation context if relevant.
-            """
-            
-            return enhanced_question
-        
-        return question
+
+        # Collect recent exchanges newest-first under a character budget,
+        # dropping oldest turns rather than truncating answers mid-span
+        # (stable turn text is what lets the model-side prompt cache hit)
+        turns = []
+        used = 0
+        for item in reversed(self.conversation_history):
+            turn = f"Previous Q: {item['question']}\nPrevious A: {item['answer']}"
+            if turns and used + len(turn) > _CONTEXT_CHAR_BUDGET:
+                break
+            turns.append(turn)
+            used += len(turn)
+
+        context_str = "\n".join(reversed(turns))
+        return _CONTEXT_TEMPLATE.format(context=context_str, question=question)
     
     def _update_conversation_history(self, question: str, answer: str):
         """
@@ -263,10 +418,6 @@ class DocumentQAAgent:
             'question': question,
             'answer': answer
         })
-        
-        # Keep only last 20 exchanges to manage memory
-        if len(self.conversation_history) > 20:
-            self.conversation_history = self.conversation_history[-20:]
     
     def get_agent_capabilities(self) -> Dict[str, Any]:
         """
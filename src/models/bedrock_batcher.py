@@ -0,0 +1,146 @@
+"""
+In-process dynamic batcher for non-latency-sensitive Bedrock calls
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import Config
+
+# Flush a pending batch once its oldest entry has waited this long
+DEFAULT_MAX_DELAY_SECONDS = 0.05
+
+
+class BedrockBatcher:
+    """
+    Collects outbound prompts briefly and submits them together
+
+    When many agent instances share one process (e.g. a web app), each
+    issuing its own invoke_model call maximizes per-request overhead and
+    throttling risk. The batcher queues prompts for up to a few
+    milliseconds, then flushes a whole batch at once: through Bedrock
+    Batch Inference when the batch is large enough and a batch role is
+    configured, otherwise as concurrent invoke_model calls sharing the
+    cached client. Latency-sensitive paths (interactive classification)
+    should keep calling BedrockModel directly and bypass the batcher.
+    """
+
+    def __init__(self, model, batch_size: Optional[int] = None,
+                 max_delay: float = DEFAULT_MAX_DELAY_SECONDS):
+        """
+        Initialize the batcher and start its flush thread
+
+        Args:
+            model: BedrockModel used for the actual Bedrock calls
+            batch_size: Flush threshold (defaults to Config.BATCH_SIZE)
+            max_delay: Max seconds a queued prompt waits before a flush
+        """
+        self.model = model
+        self.batch_size = batch_size or Config.BATCH_SIZE
+        self.max_delay = max_delay
+        self._queue: 'queue.Queue[Optional[Tuple[str, int, Future]]]' = queue.Queue()
+        self._closed = False
+        self._flush_pool = ThreadPoolExecutor(max_workers=self.batch_size)
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt: str, max_tokens: int = 4000) -> Future:
+        """
+        Queue a prompt for batched invocation
+
+        Args:
+            prompt: Input prompt for the model
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Future resolving to an invoke_model-shaped response dict
+        """
+        if self._closed:
+            raise RuntimeError('Batcher is closed')
+        future: Future = Future()
+        self._queue.put((prompt, max_tokens, future))
+        return future
+
+    def close(self) -> None:
+        """Flush remaining prompts and stop the worker thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+        self._flush_pool.shutdown(wait=True)
+
+    def _run(self) -> None:
+        """Collect prompts, flushing on size or age"""
+        pending: List[Tuple[str, int, Future]] = []
+        oldest = 0.0
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, self.max_delay - (time.perf_counter() - oldest))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush(pending)
+                pending = []
+                continue
+            if item is None:
+                self._flush(pending)
+                return
+            if not pending:
+                oldest = time.perf_counter()
+            pending.append(item)
+            if len(pending) >= self.batch_size:
+                self._flush(pending)
+                pending = []
+
+    def _flush(self, batch: List[Tuple[str, int, Future]]) -> None:
+        """Submit a collected batch and resolve its futures"""
+        if not batch:
+            return
+        if len(batch) >= self.batch_size and Config.BEDROCK_BATCH_ROLE_ARN:
+            self._flush_offline(batch)
+        else:
+            # Small flush: concurrent live calls over the shared client
+            for prompt, max_tokens, future in batch:
+                self._flush_pool.submit(self._invoke_one, prompt, max_tokens, future)
+
+    def _invoke_one(self, prompt: str, max_tokens: int, future: Future) -> None:
+        """Resolve one future with a live invoke_model call"""
+        try:
+            future.set_result(self.model.invoke_model(prompt, max_tokens=max_tokens))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _flush_offline(self, batch: List[Tuple[str, int, Future]]) -> None:
+        """Resolve a full batch through one Batch Inference job"""
+        try:
+            records = [
+                {
+                    'recordId': str(i),
+                    'modelInput': self.model._build_request_body(prompt, max_tokens)
+                }
+                for i, (prompt, max_tokens, _) in enumerate(batch)
+            ]
+            job = self.model.run_batch_inference(
+                records, f"batcher-{time.strftime('%Y%m%d%H%M%S')}"
+            )
+            for i, (_, _, future) in enumerate(batch):
+                if job['success'] and str(i) in job['outputs']:
+                    future.set_result({
+                        'success': True,
+                        'content': job['outputs'][str(i)],
+                        'usage': {}
+                    })
+                else:
+                    future.set_result({
+                        'success': False,
+                        'error': job.get('error', 'Missing batch output'),
+                        'content': None
+                    })
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
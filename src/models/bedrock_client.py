@@ -0,0 +1,53 @@
+"""
+Shared, cached boto3 session and Bedrock client
+"""
+import functools
+import boto3
+import botocore.config
+from src.config import Config
+
+@functools.lru_cache(maxsize=None)
+def get_session(profile_name: str) -> boto3.Session:
+    """
+    Get the cached boto3 session for a profile
+
+    Credential resolution runs once per profile instead of once per
+    consumer; PropertyResearchAgent alone builds three Bedrock consumers.
+
+    Args:
+        profile_name: AWS profile name
+
+    Returns:
+        Shared boto3 session
+    """
+    return boto3.Session(profile_name=profile_name)
+
+@functools.lru_cache(maxsize=None)
+def get_bedrock_client(profile_name: str, region: str):
+    """
+    Get the cached bedrock-runtime client for a profile/region pair
+
+    One shared client means one TLS connection pool across all agents:
+    adaptive retries absorb ThrottlingException inside botocore, the pool
+    is sized for the concurrent workflow fan-out, and keepalive holds
+    connections warm between calls. botocore clients are thread-safe for
+    invoke_model.
+
+    Args:
+        profile_name: AWS profile name
+        region: AWS region name
+
+    Returns:
+        Shared bedrock-runtime client
+    """
+    return get_session(profile_name).client(
+        service_name='bedrock-runtime',
+        region_name=region,
+        config=botocore.config.Config(
+            max_pool_connections=max(50, Config.BATCH_SIZE * 2),
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            connect_timeout=3,
+            read_timeout=60,
+            tcp_keepalive=True
+        )
+    )
@@ -1,16 +1,118 @@
 """
 Bedrock Model integration for StrandsDocumentProcessor
 """
-import boto3
+import botocore.exceptions
+import hashlib
 import json
-from typing import Dict, Any, Optional
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 from src.config import Config
+from src.models.bedrock_client import get_bedrock_client, get_session
+from src.models.insight_cache import InsightCache
+
+# Shared compact encoder for request bodies and batch manifests: one encoder
+# instance skips json.dumps' per-call setup, and dropping the default
+# whitespace separators shaves bytes off every request on the wire
+_dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+# Repairs applied to almost-JSON model output before giving up on it
+_FENCE_OPEN_RE = re.compile(r'^```[a-zA-Z]*\s*')
+_FENCE_CLOSE_RE = re.compile(r'```\s*$')
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_decoder = json.JSONDecoder()
+
+
+def _close_truncated(text: str) -> str:
+    """Close the open strings/brackets of JSON cut off mid-generation"""
+    stack = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if escaped:
+            escaped = False
+        elif in_string:
+            if ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]':
+            if stack:
+                stack.pop()
+    repaired = text
+    if in_string:
+        repaired += '"'
+    repaired = repaired.rstrip()
+    if repaired.endswith(','):
+        repaired = repaired[:-1]
+    elif repaired.endswith(':'):
+        repaired += ' null'
+    return repaired + ''.join(reversed(stack))
+
+
+def _loads_tolerant(content: str):
+    """
+    Parse model JSON output, repairing common deviations first
+
+    Claude occasionally wraps its JSON in markdown fences, adds prose
+    around it, leaves trailing commas, or gets truncated by max_tokens.
+    All of those still contain the data the Bedrock call was paid for, so
+    try progressively harder before discarding the response.
+
+    Args:
+        content: Raw model output text
+
+    Returns:
+        The parsed object
+
+    Raises:
+        json.JSONDecodeError: If no repair produces valid JSON
+    """
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        pass
+
+    text = _FENCE_CLOSE_RE.sub('', _FENCE_OPEN_RE.sub('', content.strip()))
+    start = text.find('{')
+    if start != -1:
+        candidate = _TRAILING_COMMA_RE.sub(r'\1', text[start:])
+        # raw_decode tolerates trailing prose after the object
+        for attempt in (candidate, _close_truncated(candidate)):
+            try:
+                return _decoder.raw_decode(attempt)[0]
+            except json.JSONDecodeError:
+                continue
+    raise json.JSONDecodeError('Unrepairable model output', content, 0)
+
 
 class BedrockModel:
     """
     AWS Bedrock model integration using Claude Sonnet
     """
-    
+
+    # Prompt templates split around the document text, cached at class level
+    # so repeated calls just concatenate instead of rebuilding the field
+    # lists and JSON schema every time. Extraction parts are keyed by
+    # document type; classification and combined prompts have one template.
+    _extraction_prompt_parts: Dict[str, tuple] = {}
+    _classification_system_prompt: Optional[str] = None
+    _combined_prompt_parts: Optional[tuple] = None
+
+    # Fixed attribute set: no per-instance __dict__, which keeps the many
+    # instances held by batch worker threads small and attribute access a
+    # slot index instead of a dict lookup
+    __slots__ = (
+        'profile_name', 'region', 'model_id', 'latency_mode',
+        '_classification_cache', '_extraction_cache', '_combined_cache',
+        '_insight_cache', '_session', 'bedrock_client'
+    )
+
     def __init__(self, profile_name: Optional[str] = None):
         """
         Initialize Bedrock client
@@ -21,47 +123,120 @@ class BedrockModel:
         self.profile_name = profile_name or Config.AWS_PROFILE
         self.region = Config.AWS_REGION
         self.model_id = Config.BEDROCK_MODEL_ID
+        self.latency_mode = Config.BEDROCK_LATENCY_MODE
+
+        # Content-hash LRU caches so re-processing identical text (re-runs,
+        # demos, duplicate uploads) never re-invokes Bedrock
+        self._classification_cache = OrderedDict()
+        self._extraction_cache = OrderedDict()
+        self._combined_cache = OrderedDict()
+
+        # Insight responses also persist on disk: re-analyzing the same
+        # property across sessions skips the most expensive Bedrock call
+        self._insight_cache = InsightCache()
         
-        # Initialize Bedrock client
-        session = boto3.Session(profile_name=self.profile_name)
-        self.bedrock_client = session.client(
-            service_name='bedrock-runtime',
-            region_name=self.region
-        )
+        # Session and bedrock-runtime client come from the shared cache, so
+        # every BedrockModel across the agents reuses one credential
+        # resolution and one warm TLS connection pool
+        self._session = get_session(self.profile_name)
+        self.bedrock_client = get_bedrock_client(self.profile_name, self.region)
+
+        if Config.WARMUP:
+            self.warmup()
+
+    def warmup(self):
+        """
+        Prime DNS resolution and the TLS connection with a tiny request
+
+        The first real invocation otherwise pays ~100-300ms of handshake
+        latency. Failures are ignored — warmup is best-effort and the real
+        call will surface any actual problem.
+        """
+        try:
+            self.invoke_model("ping", max_tokens=1)
+        except Exception:
+            pass
     
-    def invoke_model(self, prompt: str, max_tokens: int = 4000) -> Dict[str, Any]:
+    def _build_request_body(self, prompt: str, max_tokens: int = 4000,
+                            system: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the Claude request body shared by the live and batch paths
+
+        Args:
+            prompt: Input prompt for the model
+            max_tokens: Maximum tokens to generate
+            system: Optional system prompt, marked for prompt caching
+
+        Returns:
+            Request body ready for invoke_model or a batch manifest record
+        """
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.1,
+            "top_p": 0.9
+        }
+
+        if system:
+            # Prompt caching requires a byte-identical prefix, so callers
+            # should pass a constant system string
+            body["system"] = [
+                {
+                    "type": "text",
+                    "text": system,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+
+        return body
+
+    def invoke_model(self, prompt: str, max_tokens: int = 4000, system: Optional[str] = None,
+                     model_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Invoke Claude Sonnet model via Bedrock
-        
+
         Args:
             prompt: Input prompt for the model
             max_tokens: Maximum tokens to generate
-            
+            system: Optional system prompt, marked for Anthropic prompt caching
+                so repeated calls reuse the stable prefix instead of paying
+                full input-token cost each time
+            model_id: Optional model override (e.g. a cheaper tier for
+                simple calls); defaults to the configured model
+
         Returns:
             Model response as dictionary
         """
+        model_id = model_id or self.model_id
         try:
-            # Prepare request body for Claude
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": max_tokens,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.1,
-                "top_p": 0.9
+            body = self._build_request_body(prompt, max_tokens, system)
+
+            request_args = {
+                'modelId': model_id,
+                'body': _dumps(body),
+                'contentType': 'application/json',
+                'accept': 'application/json'
             }
-            
-            # Invoke model
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(body),
-                contentType='application/json',
-                accept='application/json'
-            )
+            if self.latency_mode == 'optimized':
+                request_args['performanceConfigLatency'] = 'optimized'
+
+            # Invoke model, dropping back to standard latency permanently if
+            # this model/region doesn't support the optimized tier
+            try:
+                response = self.bedrock_client.invoke_model(**request_args)
+            except (self.bedrock_client.exceptions.ValidationException,
+                    botocore.exceptions.ParamValidationError):
+                if self.latency_mode != 'optimized':
+                    raise
+                self.latency_mode = 'standard'
+                request_args.pop('performanceConfigLatency', None)
+                response = self.bedrock_client.invoke_model(**request_args)
             
             # Parse response
             response_body = json.loads(response['body'].read())
@@ -70,15 +245,15 @@ class BedrockModel:
                 'success': True,
                 'content': response_body.get('content', [{}])[0].get('text', ''),
                 'usage': response_body.get('usage', {}),
-                'model_id': self.model_id
+                'model_id': model_id
             }
-            
+
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e),
                 'content': '',
-                'model_id': self.model_id
+                'model_id': model_id
             }
     
     def extract_document_data(self, document_text: str, document_type: str) -> Dict[str, Any]:
@@ -92,16 +267,180 @@ class BedrockModel:
         Returns:
             Extracted data as dictionary
         """
-        extraction_fields = Config.EXTRACTION_FIELDS.get(document_type, [])
-        
-        prompt = f"""
+        cache_key = (self._text_hash(document_text), document_type)
+        cached = self._extraction_cache.get(cache_key)
+        if cached is not None:
+            self._extraction_cache.move_to_end(cache_key)
+            return cached
+
+        response = self.invoke_model(self._build_extraction_prompt(document_text, document_type))
+
+        if response['success']:
+            result = self._parse_extraction_content(response['content'], document_type)
+            self._cache_put(self._extraction_cache, cache_key, result)
+            return result
+        else:
+            return {
+                'document_type': document_type,
+                'extracted_data': {},
+                'confidence_score': 0.0,
+                'processing_notes': f'Model invocation failed: {response["error"]}'
+            }
+
+    def extract_document_data_batch(self, texts: List[str], document_type: str) -> List[Dict[str, Any]]:
+        """
+        Extract structured data from many documents via Batch Inference
+
+        One Bedrock batch job replaces N synchronous invoke_model calls at
+        roughly half the on-demand cost; use for offline workloads where
+        minutes of job latency are acceptable.
+
+        Args:
+            texts: Document texts to extract from
+            document_type: Type applied to every document in the batch
+
+        Returns:
+            List of extraction results in input order
+        """
+        records = [
+            {
+                'recordId': str(i),
+                'modelInput': self._build_request_body(
+                    self._build_extraction_prompt(text, document_type)
+                )
+            }
+            for i, text in enumerate(texts)
+        ]
+        job = self.run_batch_inference(records, f"extract-{time.strftime('%Y%m%d%H%M%S')}")
+
+        if not job['success']:
+            return [{
+                'document_type': document_type,
+                'extracted_data': {},
+                'confidence_score': 0.0,
+                'processing_notes': f'Batch extraction failed: {job["error"]}'
+            } for _ in texts]
+
+        return [
+            self._parse_extraction_content(job['outputs'].get(str(i), ''), document_type)
+            for i in range(len(texts))
+        ]
+
+    @staticmethod
+    def _text_hash(document_text: str) -> str:
+        """Content hash used to key the response caches"""
+        return hashlib.sha256(document_text.encode()).hexdigest()
+
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key, value, maxsize: int = 1024) -> None:
+        """Insert into an LRU cache, evicting the oldest entry on overflow"""
+        cache[key] = value
+        if len(cache) > maxsize:
+            cache.popitem(last=False)
+
+    def invoke_model_stream(self, prompt: str, max_tokens: int = 4000,
+                            system: Optional[str] = None,
+                            on_delta=None) -> Dict[str, Any]:
+        """
+        Invoke the model with a streaming response
+
+        The full content is still assembled and returned in the same shape as
+        invoke_model, but each text delta is handed to on_delta as it
+        arrives, so callers can surface partial output at first-token latency
+        instead of waiting for the complete answer.
+
+        Args:
+            prompt: Input prompt for the model
+            max_tokens: Maximum tokens to generate
+            system: Optional system prompt, marked for prompt caching
+            on_delta: Optional callable invoked with each text delta
+
+        Returns:
+            Model response as dictionary (same shape as invoke_model)
+        """
+        try:
+            body = self._build_request_body(prompt, max_tokens, system)
+
+            request_args = {
+                'modelId': self.model_id,
+                'body': _dumps(body),
+                'contentType': 'application/json',
+                'accept': 'application/json'
+            }
+            if self.latency_mode == 'optimized':
+                request_args['performanceConfigLatency'] = 'optimized'
+
+            try:
+                response = self.bedrock_client.invoke_model_with_response_stream(**request_args)
+            except (self.bedrock_client.exceptions.ValidationException,
+                    botocore.exceptions.ParamValidationError):
+                if self.latency_mode != 'optimized':
+                    raise
+                self.latency_mode = 'standard'
+                request_args.pop('performanceConfigLatency', None)
+                response = self.bedrock_client.invoke_model_with_response_stream(**request_args)
+
+            content_parts = []
+            usage = {}
+            for event in response['body']:
+                chunk = json.loads(event['chunk']['bytes'])
+                if chunk.get('type') == 'content_block_delta':
+                    delta = chunk.get('delta', {}).get('text', '')
+                    if delta:
+                        content_parts.append(delta)
+                        if on_delta:
+                            on_delta(delta)
+                elif chunk.get('type') == 'message_delta':
+                    usage = chunk.get('usage', usage)
+
+            return {
+                'success': True,
+                'content': ''.join(content_parts),
+                'usage': usage,
+                'model_id': self.model_id
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'content': '',
+                'model_id': self.model_id
+            }
+
+    def _build_extraction_prompt(self, document_text: str, document_type: str) -> str:
+        """Build the extraction prompt for a document type (shared by the
+        live and batch paths); everything except the document text comes
+        from a cached per-type template"""
+        parts = self._extraction_prompt_parts.get(document_type)
+        if parts is None:
+            parts = self._build_extraction_prompt_parts(document_type)
+            type(self)._extraction_prompt_parts[document_type] = parts
+        prefix, suffix = parts
+        return prefix + document_text + suffix
+
+    @staticmethod
+    def _build_extraction_prompt_parts(document_type: str) -> tuple:
+        """Build the static (prefix, suffix) extraction template for a type"""
+        fields_str = Config.EXTRACTION_FIELDS_STR.get(document_type)
+        if fields_str is None:
+            # Unknown type (e.g. a speculative extraction running before
+            # classification finishes): ask for the union of all known fields
+            extraction_fields = []
+            for fields in Config.EXTRACTION_FIELDS.values():
+                for field in fields:
+                    if field not in extraction_fields:
+                        extraction_fields.append(field)
+            fields_str = ', '.join(extraction_fields)
+
+        template = f"""
         You are a real estate document processing expert. Extract the following information from this {document_type} document:
-        
-        Fields to extract: {', '.join(extraction_fields)}
-        
+
+        Fields to extract: {fields_str}
+
         Document text:
-        {document_text}
-        
+        {{document_text}}
+
         Please return the extracted information in JSON format with the following structure:
         {{
             "document_type": "{document_type}",
@@ -120,50 +459,206 @@ class BedrockModel:
         - Normalize currency amounts to numbers without symbols
         - Be precise and accurate
         """
-        
-        response = self.invoke_model(prompt)
-        
-        if response['success']:
-            try:
-                # Try to parse JSON from response
-                extracted_data = json.loads(response['content'])
-                return extracted_data
-            except json.JSONDecodeError:
-                # If JSON parsing fails, return raw response
-                return {
-                    'document_type': document_type,
-                    'extracted_data': {},
-                    'confidence_score': 0.0,
-                    'processing_notes': f'Failed to parse extraction results: {response["content"]}'
-                }
-        else:
+        return tuple(template.split('{document_text}', 1))
+
+    def _parse_extraction_content(self, content: str, document_type: str) -> Dict[str, Any]:
+        """Parse the model's extraction output, falling back to an empty
+        result when the JSON is malformed"""
+        try:
+            return _loads_tolerant(content)
+        except json.JSONDecodeError:
             return {
                 'document_type': document_type,
                 'extracted_data': {},
                 'confidence_score': 0.0,
-                'processing_notes': f'Model invocation failed: {response["error"]}'
+                'processing_notes': f'Failed to parse extraction results: {content}'
             }
-    
-    def classify_document(self, document_text: str) -> Dict[str, Any]:
+
+    def classify_document(self, document_text: str,
+                          model_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Classify document type
-        
+
+        Sorting into three fixed categories doesn't need the main model, so
+        classification runs on the cheaper Config.CLASSIFICATION_MODEL_ID
+        first and escalates to the configured model only when the cheap
+        pass comes back with confidence below the escalation threshold.
+
         Args:
             document_text: Raw text from document
-            
+            model_id: Optional model override; defaults to the cheap
+                classification tier
+
         Returns:
             Classification result
         """
-        document_types = Config.DOCUMENT_TYPES
-        
-        prompt = f"""
-        You are a real estate document classifier. Analyze the following document text and classify it into one of these categories:
-        
-        Categories: {', '.join(document_types)}
-        
+        cache_key = self._text_hash(document_text)
+        cached = self._classification_cache.get(cache_key)
+        if cached is not None:
+            self._classification_cache.move_to_end(cache_key)
+            return cached
+
+        # Classification emits a three-field JSON object; a small token
+        # budget keeps the output window from padding out the call
+        response = self.invoke_model(
+            self._build_classification_prompt(document_text),
+            max_tokens=256,
+            system=self._build_classification_system(),
+            model_id=model_id or Config.CLASSIFICATION_MODEL_ID
+        )
+
+        if response['success']:
+            result = self._parse_classification_content(response['content'])
+            if (model_id is None
+                    and Config.CLASSIFICATION_MODEL_ID != self.model_id
+                    and result.get('confidence_score', 0.0) < Config.CLASSIFICATION_ESCALATION_THRESHOLD):
+                # Cheap tier wasn't sure; one retry on the stronger model
+                escalated = self.invoke_model(
+                    self._build_classification_prompt(document_text),
+                    max_tokens=256,
+                    system=self._build_classification_system(),
+                    model_id=self.model_id
+                )
+                if escalated['success']:
+                    result = self._parse_classification_content(escalated['content'])
+            self._cache_put(self._classification_cache, cache_key, result)
+            return result
+        else:
+            return {
+                'document_type': 'unknown',
+                'confidence_score': 0.0,
+                'reasoning': f'Classification failed: {response["error"]}'
+            }
+
+    def classify_and_extract(self, document_text: str) -> Dict[str, Any]:
+        """
+        Classify a document and extract its data in one Bedrock round trip
+
+        Halves the per-document Bedrock latency and token spend compared to
+        calling classify_document and extract_document_data separately.
+
+        Args:
+            document_text: Raw text from document
+
+        Returns:
+            Dict with 'classification' and 'extraction' keys, each in the
+            same shape as the corresponding single-purpose method
+        """
+        cache_key = self._text_hash(document_text)
+        cached = self._combined_cache.get(cache_key)
+        if cached is not None:
+            self._combined_cache.move_to_end(cache_key)
+            return cached
+
+        response = self.invoke_model(self._build_combined_prompt(document_text))
+
+        if response['success']:
+            result = self._parse_combined_content(response['content'])
+            self._cache_put(self._combined_cache, cache_key, result)
+            return result
+        else:
+            return {
+                'classification': {
+                    'document_type': 'unknown',
+                    'confidence_score': 0.0,
+                    'reasoning': f'Classification failed: {response["error"]}'
+                },
+                'extraction': {
+                    'document_type': 'unknown',
+                    'extracted_data': {},
+                    'confidence_score': 0.0,
+                    'processing_notes': f'Model invocation failed: {response["error"]}'
+                }
+            }
+
+    def _build_combined_prompt(self, document_text: str) -> str:
+        """Build the single-call classify-and-extract prompt from a cached
+        template"""
+        parts = self._combined_prompt_parts
+        if parts is None:
+            field_listing = "\n".join(
+                f"        - {doc_type}: {fields_str}"
+                for doc_type, fields_str in Config.EXTRACTION_FIELDS_STR.items()
+            )
+
+            template = f"""
+        You are a real estate document processing expert. First classify the following document into one of these categories, then extract the fields defined for that category:
+
+        Categories: {Config.DOCUMENT_TYPES_STR}
+
+        Fields per category:
+{field_listing}
+
         Document text:
-        {document_text[:2000]}...  # First 2000 characters for classification
-        
+        {{document_text}}
+
+        Please return your result in JSON format with the following structure:
+        {{
+            "classification": {{
+                "document_type": "one of the categories above",
+                "confidence_score": // A number between 0-1,
+                "reasoning": "Brief explanation of why you classified it this way"
+            }},
+            "extraction": {{
+                "document_type": "same as above",
+                "extracted_data": {{
+                    // Include only the fields defined for the classified category
+                    // Use null for fields that cannot be found
+                }},
+                "confidence_score": // A number between 0-1 indicating extraction confidence,
+                "processing_notes": "Any issues or observations about the document quality or extraction"
+            }}
+        }}
+
+        Important guidelines:
+        - Only extract information that is clearly present in the document
+        - Use null for missing information
+        - Normalize dates to YYYY-MM-DD format
+        - Normalize currency amounts to numbers without symbols
+        - Be precise and accurate
+        """
+            parts = tuple(template.split('{document_text}', 1))
+            type(self)._combined_prompt_parts = parts
+        prefix, suffix = parts
+        return prefix + document_text + suffix
+
+    def _parse_combined_content(self, content: str) -> Dict[str, Any]:
+        """Parse the combined classify-and-extract output, falling back to
+        unknown/empty results when the JSON is malformed"""
+        try:
+            result = _loads_tolerant(content)
+            if 'classification' in result and 'extraction' in result:
+                return result
+        except json.JSONDecodeError:
+            pass
+        return {
+            'classification': {
+                'document_type': 'unknown',
+                'confidence_score': 0.0,
+                'reasoning': f'Failed to parse combined result: {content}'
+            },
+            'extraction': {
+                'document_type': 'unknown',
+                'extracted_data': {},
+                'confidence_score': 0.0,
+                'processing_notes': f'Failed to parse combined result: {content}'
+            }
+        }
+
+    def _build_classification_system(self) -> str:
+        """Build the constant classification system prompt
+
+        Everything fixed (role, categories, response schema) lives here so
+        Bedrock prompt caching can reuse the prefix across documents; only
+        the document text travels in the user message.
+        """
+        system = self._classification_system_prompt
+        if system is None:
+            system = f"""
+        You are a real estate document classifier. Analyze the document text provided by the user and classify it into one of these categories:
+
+        Categories: {Config.DOCUMENT_TYPES_STR}
+
         Please return your classification in JSON format:
         {{
             "document_type": "one of the categories above",
@@ -171,33 +666,130 @@ class BedrockModel:
             "reasoning": "Brief explanation of why you classified it this way"
         }}
         """
-        
-        response = self.invoke_model(prompt)
-        
-        if response['success']:
-            try:
-                classification = json.loads(response['content'])
-                return classification
-            except json.JSONDecodeError:
-                return {
-                    'document_type': 'unknown',
-                    'confidence_score': 0.0,
-                    'reasoning': f'Failed to parse classification: {response["content"]}'
-                }
-        else:
+            type(self)._classification_system_prompt = system
+        return system
+
+    def _build_classification_prompt(self, document_text: str) -> str:
+        """Build the variable (user) part of the classification prompt,
+        truncated on a word boundary; pair with _build_classification_system"""
+        snippet = document_text
+        if len(snippet) > 1500:
+            snippet = snippet[:1500].rsplit(' ', 1)[0]
+        return f"Document text:\n{snippet}"
+
+    def _parse_classification_content(self, content: str) -> Dict[str, Any]:
+        """Parse the model's classification output, falling back to unknown
+        when the JSON is malformed"""
+        try:
+            return _loads_tolerant(content)
+        except json.JSONDecodeError:
             return {
                 'document_type': 'unknown',
                 'confidence_score': 0.0,
-                'reasoning': f'Classification failed: {response["error"]}'
+                'reasoning': f'Failed to parse classification: {content}'
             }
-    
-    def generate_property_insights(self, analysis_prompt: str) -> Dict[str, Any]:
+
+    def run_batch_inference(self, records: List[Dict[str, Any]], job_name: str,
+                            poll_interval: int = 30) -> Dict[str, Any]:
+        """
+        Run a Bedrock Batch Inference job over prebuilt request bodies
+
+        Batch inference costs roughly half of on-demand and avoids per-call
+        rate limits, at the price of minutes of queueing — use it for large
+        offline jobs, not interactive calls.
+
+        Args:
+            records: Manifest records of {'recordId': ..., 'modelInput': body}
+            job_name: Unique job name, also used as the S3 staging prefix
+            poll_interval: Seconds between job status polls
+
+        Returns:
+            Result with a recordId -> generated content mapping
+        """
+        if not Config.BEDROCK_BATCH_ROLE_ARN or not Config.BEDROCK_BATCH_S3_BUCKET:
+            return {
+                'success': False,
+                'error': 'Batch inference requires BEDROCK_BATCH_ROLE_ARN and BEDROCK_BATCH_S3_BUCKET',
+                'outputs': {}
+            }
+
+        bucket = Config.BEDROCK_BATCH_S3_BUCKET
+        input_key = f"batch-inference/{job_name}/input.jsonl"
+        output_prefix = f"batch-inference/{job_name}/output/"
+
+        try:
+            s3_client = self._session.client('s3', region_name=self.region)
+            bedrock = self._session.client('bedrock', region_name=self.region)
+
+            # Stage the JSONL manifest
+            manifest = "\n".join(_dumps(record) for record in records)
+            s3_client.put_object(Bucket=bucket, Key=input_key, Body=manifest.encode())
+
+            # Create the job and poll until it finishes
+            job = bedrock.create_model_invocation_job(
+                jobName=job_name,
+                modelId=self.model_id,
+                roleArn=Config.BEDROCK_BATCH_ROLE_ARN,
+                inputDataConfig={'s3InputDataConfig': {'s3Uri': f"s3://{bucket}/{input_key}"}},
+                outputDataConfig={'s3OutputDataConfig': {'s3Uri': f"s3://{bucket}/{output_prefix}"}}
+            )
+            job_arn = job['jobArn']
+
+            while True:
+                status = bedrock.get_model_invocation_job(jobIdentifier=job_arn)['status']
+                if status in ('Completed', 'Failed', 'Stopped', 'Expired'):
+                    break
+                time.sleep(poll_interval)
+
+            if status != 'Completed':
+                return {
+                    'success': False,
+                    'error': f'Batch job ended with status: {status}',
+                    'outputs': {}
+                }
+
+            # Download and join the output records
+            outputs = {}
+            listing = s3_client.list_objects_v2(Bucket=bucket, Prefix=output_prefix)
+            for obj in listing.get('Contents', []):
+                if not obj['Key'].endswith('.jsonl.out'):
+                    continue
+                data = s3_client.get_object(Bucket=bucket, Key=obj['Key'])['Body'].read()
+                for line in data.splitlines():
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    model_output = record.get('modelOutput', {})
+                    content = model_output.get('content', [{}])[0].get('text', '')
+                    outputs[record.get('recordId', '')] = content
+
+            return {
+                'success': True,
+                'outputs': outputs,
+                'error': None
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Batch inference failed: {str(e)}',
+                'outputs': {}
+            }
+
+    def generate_property_insights(self, analysis_prompt: str,
+                                   on_delta=None) -> Dict[str, Any]:
         """
         Generate AI insights for property analysis
-        
+
+        When on_delta is provided, the 6000-token response is streamed and
+        each text delta is forwarded as it arrives, so callers can render
+        progress during the longest Bedrock call in the research workflow
+        instead of waiting for the full payload.
+
         Args:
             analysis_prompt: Formatted prompt with property and market data
-            
+            on_delta: Optional callable invoked with each streamed text delta
+
         Returns:
             AI-generated insights and analysis
         """
@@ -235,12 +827,21 @@ class BedrockModel:
         
         Base your analysis on the provided data and real estate market principles.
         """
-        
-        response = self.invoke_model(enhanced_prompt, max_tokens=6000)
-        
+
+        cached = self._insight_cache.get(enhanced_prompt)
+        if cached is not None:
+            return cached
+
+        if on_delta is not None:
+            response = self.invoke_model_stream(enhanced_prompt, max_tokens=6000,
+                                                on_delta=on_delta)
+        else:
+            response = self.invoke_model(enhanced_prompt, max_tokens=6000)
+
         if response['success']:
             try:
-                insights = json.loads(response['content'])
+                insights = _loads_tolerant(response['content'])
+                self._insight_cache.put(enhanced_prompt, insights)
                 return insights
             except json.JSONDecodeError:
                 return {
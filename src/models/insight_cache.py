@@ -0,0 +1,119 @@
+"""
+Persistent cache for Bedrock property-insight responses
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+# Default locations and limits; entries expire after a day since market data
+# embedded in the prompts goes stale
+DEFAULT_CACHE_PATH = os.path.join('.rag_cache', 'insights.db')
+DEFAULT_TTL_SECONDS = 86400
+MAX_ENTRIES = 1024
+
+# Compact shared encoder: skips json.dumps' per-call setup and stores rows
+# without separator whitespace
+_dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+class InsightCache:
+    """
+    SQLite-backed cache keyed by prompt content hash
+
+    Repeat analyses of the same property (re-runs, retries after transient
+    AWS failures, duplicate uploads) become local lookups instead of
+    6000-token Bedrock round trips. Entries carry a TTL and the table is
+    capped with least-recently-accessed eviction.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database file path
+            ttl: Seconds before an entry expires
+        """
+        self.path = path
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS insights ("
+                " prompt_hash TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+
+    def get(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response for a prompt
+
+        Args:
+            prompt: Full analysis prompt
+
+        Returns:
+            Cached response dict, or None on miss/expiry
+        """
+        prompt_hash = self._hash(prompt)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created FROM insights WHERE prompt_hash = ?",
+                    (prompt_hash,)
+                ).fetchone()
+                if row is None:
+                    return None
+                response, created = row
+                if now - created > self.ttl:
+                    conn.execute("DELETE FROM insights WHERE prompt_hash = ?", (prompt_hash,))
+                    return None
+                conn.execute(
+                    "UPDATE insights SET last_access = ? WHERE prompt_hash = ?",
+                    (now, prompt_hash)
+                )
+                return json.loads(response)
+        except (sqlite3.Error, json.JSONDecodeError):
+            # Cache trouble must never break the workflow; treat as a miss
+            return None
+
+    def put(self, prompt: str, response: Dict[str, Any]) -> None:
+        """
+        Store a response for a prompt, evicting stale entries
+
+        Args:
+            prompt: Full analysis prompt
+            response: Parsed response dict to cache
+        """
+        prompt_hash = self._hash(prompt)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO insights"
+                    " (prompt_hash, response, created, last_access)"
+                    " VALUES (?, ?, ?, ?)",
+                    (prompt_hash, _dumps(response), now, now)
+                )
+                conn.execute("DELETE FROM insights WHERE created < ?", (now - self.ttl,))
+                conn.execute(
+                    "DELETE FROM insights WHERE prompt_hash IN ("
+                    " SELECT prompt_hash FROM insights"
+                    " ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (MAX_ENTRIES,)
+                )
+        except sqlite3.Error:
+            pass
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a short-lived connection (safe across threads/processes)"""
+        return sqlite3.connect(self.path, timeout=5)
+
+    @staticmethod
+    def _hash(prompt: str) -> str:
+        """Content hash used as the cache key"""
+        return hashlib.sha256(prompt.encode()).hexdigest()
@@ -0,0 +1,108 @@
+"""
+Length-prefixed binary framing for persisted workflow results
+
+Workflow results are nested dicts of small strings and numbers. Writing
+them as compact frames — a 4-byte big-endian length header followed by a
+compact JSON payload — lets many results share one append-only file and
+lets readers skip records without parsing them. A frame stream is also
+self-describing enough for backfill: `python -m src.storage.result_codec
+old1.json old2.json > results.bin` converts legacy pretty-printed JSON
+files into a frame stream.
+"""
+import json
+import struct
+import sys
+from typing import Any, BinaryIO, Iterator, Optional
+
+# 4-byte big-endian unsigned payload length
+_HEADER = struct.Struct('>I')
+
+# Compact shared encoder: no separator whitespace, bound once instead of
+# rebuilding json.dumps arguments per record
+_dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=str).encode
+
+
+def encode(obj: Any) -> bytes:
+    """
+    Encode one object as a length-prefixed frame
+
+    Args:
+        obj: JSON-serializable object (non-serializable leaves fall back to str)
+
+    Returns:
+        Header + compact payload bytes, ready to append to a frame stream
+    """
+    payload = _dumps(obj).encode('utf-8')
+    return _HEADER.pack(len(payload)) + payload
+
+
+def decode(frame: bytes) -> Any:
+    """
+    Decode one complete frame produced by encode
+
+    Args:
+        frame: Header + payload bytes
+
+    Returns:
+        The decoded object
+    """
+    (length,) = _HEADER.unpack_from(frame)
+    return json.loads(frame[_HEADER.size:_HEADER.size + length])
+
+
+def decode_stream(fp: BinaryIO) -> Iterator[Any]:
+    """
+    Yield objects from a stream of frames
+
+    Args:
+        fp: Binary file-like object positioned at a frame boundary
+
+    Yields:
+        Each decoded object in order
+
+    Raises:
+        ValueError: If the stream ends mid-frame
+    """
+    while True:
+        obj = read_one(fp)
+        if obj is None:
+            return
+        yield obj
+
+
+def read_one(fp: BinaryIO) -> Optional[Any]:
+    """
+    Read a single frame from a stream
+
+    Args:
+        fp: Binary file-like object positioned at a frame boundary
+
+    Returns:
+        The decoded object, or None at end of stream
+
+    Raises:
+        ValueError: If the stream ends mid-frame
+    """
+    header = fp.read(_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        raise ValueError('Truncated frame header')
+    (length,) = _HEADER.unpack(header)
+    payload = fp.read(length)
+    if len(payload) < length:
+        raise ValueError('Truncated frame payload')
+    return json.loads(payload)
+
+
+def _backfill(paths) -> None:
+    """Convert legacy JSON result files to frames on stdout"""
+    out = sys.stdout.buffer
+    for path in paths:
+        with open(path, 'r') as f:
+            out.write(encode(json.load(f)))
+    out.flush()
+
+
+if __name__ == '__main__':
+    _backfill(sys.argv[1:])
@@ -1,11 +1,83 @@
 """
 RAG (Retrieval-Augmented Generation) tool for document Q&A
 """
+import hashlib
+import os
 import re
+import sys
+import numpy as np
+from collections import Counter, OrderedDict
 from typing import Dict, Any, List, Optional, Tuple
 from src.models.bedrock_model import BedrockModel
 from src.tools.document_processor import DocumentProcessor
 
+# Chunking strategy: 'structure' splits on heading lines first and falls back
+# to fixed-size chunking when no headings are found; 'fixed' always uses
+# fixed-size chunking
+CHUNK_STRATEGY = os.environ.get('CHUNK_STRATEGY', 'structure')
+
+# ALL-CAPS lines like "PROPERTY INFORMATION" or "COMMISSION DETAILS" that
+# mark section boundaries in real estate documents
+_HEADING_RE = re.compile(r'^[A-Z][A-Z\s]{4,}$', re.M)
+
+# Hot-path patterns compiled once; re's own cache is small and LRU-evicted
+_WS_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Common stop words excluded from keyword matching
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that',
+    'these', 'those', 'what', 'when', 'where', 'why', 'how', 'who', 'which'
+})
+
+# Stable answer-generation instructions, kept as a module constant so the
+# system prompt stays byte-identical across questions and Bedrock's Anthropic
+# prompt cache can reuse the prefix
+ANSWER_SYSTEM_PROMPT = """
+Based on document excerpts provided by the user, answer their question accurately and concisely.
+
+Please provide your response in the following JSON format:
+{
+    "answer": "Your detailed answer based on the document content",
+    "confidence": 0.0-1.0,
+    "reasoning": "Brief explanation of how you arrived at this answer",
+    "source_chunks": [list of chunk IDs that were most relevant]
+}
+
+Guidelines:
+- Only use information from the provided document excerpts
+- If the answer isn't in the document, say so clearly
+- Provide specific details and quotes when possible
+- Rate your confidence based on how well the document supports your answer
+- Be concise but comprehensive
+"""
+
+# Variant of the answer instructions for multi-question calls; the model
+# returns one JSON object per question, in order
+BATCH_ANSWER_SYSTEM_PROMPT = """
+Based on document excerpts provided by the user, answer each of their numbered questions accurately and concisely.
+
+Please provide your response as a JSON array with one object per question, in the same order as the questions:
+[
+    {
+        "question_number": 1,
+        "answer": "Your detailed answer based on the document content",
+        "confidence": 0.0-1.0,
+        "reasoning": "Brief explanation of how you arrived at this answer",
+        "source_chunks": [list of chunk IDs that were most relevant]
+    }
+]
+
+Guidelines:
+- Only use information from the provided document excerpts
+- If an answer isn't in the document, say so clearly
+- Provide specific details and quotes when possible
+- Rate your confidence based on how well the document supports each answer
+- Be concise but comprehensive
+"""
+
 class DocumentRAGTool:
     """
     RAG tool for answering questions about documents using retrieval and generation
@@ -30,6 +102,10 @@ class DocumentRAGTool:
             'metadata': {},
             'file_path': ''
         }
+
+        # Prepared documents keyed by file content hash; reloading the same
+        # bytes skips text extraction, chunking and term indexing entirely
+        self._document_cache = OrderedDict()
     
     def load_document(self, file_path: str) -> Dict[str, Any]:
         """
@@ -42,8 +118,24 @@ class DocumentRAGTool:
             Processing result with document chunks
         """
         try:
+            # Cheap content hash first: reloading identical bytes reuses the
+            # prepared chunks and term index from a previous load
+            with open(file_path, 'rb') as f:
+                # fstat on the already-open descriptor: one stat serves
+                # hashing, validation, and metadata downstream
+                file_stat = os.fstat(f.fileno())
+                doc_hash = hashlib.sha256(f.read()).hexdigest()
+            cached = self._document_cache.get(doc_hash)
+            if cached is not None:
+                self._document_cache.move_to_end(doc_hash)
+                self.current_document = dict(cached['document'])
+                self.current_document['file_path'] = file_path
+                return dict(cached['load_result'])
+
             # Process the document to extract text
-            processing_result = self.document_processor.process_document(file_path)
+            processing_result = self.document_processor.process_document(
+                file_path, file_stat=file_stat
+            )
             
             if not processing_result['success']:
                 return {
@@ -55,24 +147,60 @@ class DocumentRAGTool:
             document_text = processing_result['text']
             metadata = processing_result['metadata']
             
-            # Split document into chunks for better retrieval
-            chunks = self._chunk_document(document_text)
-            
+            # Split document into chunks for better retrieval, preferring
+            # structure-aware chunking when the document has headings
+            chunks = None
+            if CHUNK_STRATEGY == 'structure':
+                chunks = self._structure_chunk_document(document_text)
+            if chunks is None:
+                chunks = self._chunk_document(document_text)
+
+            # Drop tiny fragments (lone dates, stray table cells) before they
+            # enter the retrieval index; they only attract bad matches
+            raw_count = len(chunks)
+            chunks = [
+                chunk for chunk in chunks
+                if len(chunk['text'].strip()) >= 30
+                and sum(chunk['term_counts'].values()) >= 5
+            ]
+            for new_id, chunk in enumerate(chunks):
+                chunk['id'] = new_id
+            filtered_count = raw_count - len(chunks)
+
+            # Inverted index over the term frequencies: retrieval touches
+            # only the postings for a question's keywords instead of
+            # scanning every chunk's text
+            index, df = self._build_index(chunks)
+
             # Store document for Q&A
             self.current_document = {
                 'text': document_text,
                 'chunks': chunks,
                 'metadata': metadata,
-                'file_path': file_path
+                'file_path': file_path,
+                'index': index,
+                'df': df
             }
-            
-            return {
+
+            load_result = {
                 'success': True,
                 'text_length': len(document_text),
                 'chunks_count': len(chunks),
+                'filtered_count': filtered_count,
                 'metadata': metadata,
                 'preview': document_text[:500] + "..." if len(document_text) > 500 else document_text
             }
+
+            # Keep a handful of prepared documents around (LRU) so switching
+            # back and forth between recent files stays instant
+            self._document_cache[doc_hash] = {
+                'document': dict(self.current_document),
+                'load_result': dict(load_result)
+            }
+            while len(self._document_cache) > 8:
+                self._document_cache.popitem(last=False)
+
+            return load_result
             
         except Exception as e:
             return {
@@ -81,7 +209,8 @@ class DocumentRAGTool:
                 'chunks_count': 0
             }
     
-    def ask_question(self, question: str, max_chunks: int = 5) -> Dict[str, Any]:
+    def ask_question(self, question: str, max_chunks: int = 5,
+                     stream_callback=None) -> Dict[str, Any]:
         """
         Answer a question about the loaded document using RAG
         
@@ -106,7 +235,8 @@ class DocumentRAGTool:
             relevant_chunks = self._retrieve_relevant_chunks(question, max_chunks)
             
             # Generate answer using retrieved context
-            answer_result = self._generate_answer(question, relevant_chunks)
+            answer_result = self._generate_answer(question, relevant_chunks,
+                                                  stream_callback=stream_callback)
             
             return {
                 'success': True,
@@ -127,6 +257,125 @@ class DocumentRAGTool:
                 'confidence': 0.0
             }
     
+    def ask_questions(self, questions: List[str], max_chunks: int = 8) -> List[Dict[str, Any]]:
+        """
+        Answer several questions about the loaded document in one Bedrock call
+
+        Context is retrieved once over the union of the questions and all
+        answers come back from a single invocation, so K questions cost one
+        round trip instead of K.
+
+        Args:
+            questions: User's questions about the document
+            max_chunks: Maximum number of relevant chunks to use
+
+        Returns:
+            List of per-question results in the same shape as ask_question
+        """
+        if not self.current_document['text']:
+            return [{
+                'success': False,
+                'error': "No document loaded. Please load a document first.",
+                'answer': '',
+                'relevant_chunks': [],
+                'confidence': 0.0
+            } for _ in questions]
+
+        try:
+            # One retrieval pass over the union of all questions
+            relevant_chunks = self._retrieve_relevant_chunks(' '.join(questions), max_chunks)
+
+            context = "\n\n".join([f"[Chunk {chunk['chunk_id']}]: {chunk['text']}"
+                                  for chunk in relevant_chunks])
+            question_listing = "\n".join(
+                f"{i}. {question}" for i, question in enumerate(questions, 1)
+            )
+            prompt = f"""
+        DOCUMENT EXCERPTS:
+        {context}
+
+        QUESTIONS:
+        {question_listing}
+        """
+
+            response = self.bedrock_model.invoke_model(
+                prompt, max_tokens=4000, system=BATCH_ANSWER_SYSTEM_PROMPT
+            )
+
+            if not response['success']:
+                return [{
+                    'success': False,
+                    'error': f"Question answering failed: {response['error']}",
+                    'answer': '',
+                    'relevant_chunks': [],
+                    'confidence': 0.0
+                } for _ in questions]
+
+            answers = self._parse_batch_answers(response['content'], len(questions))
+            return [{
+                'success': True,
+                'question': question,
+                'answer': answer['answer'],
+                'relevant_chunks': relevant_chunks,
+                'confidence': answer['confidence'],
+                'reasoning': answer.get('reasoning', ''),
+                'chunk_count_used': len(relevant_chunks)
+            } for question, answer in zip(questions, answers)]
+
+        except Exception as e:
+            return [{
+                'success': False,
+                'error': f"Question answering failed: {str(e)}",
+                'answer': '',
+                'relevant_chunks': [],
+                'confidence': 0.0
+            } for _ in questions]
+
+    def _parse_batch_answers(self, content: str, expected: int) -> List[Dict[str, Any]]:
+        """
+        Parse the model's batched answer array, padding or trimming to the
+        expected question count when the model misbehaves
+
+        Args:
+            content: Raw model output, expected to be a JSON array
+            expected: Number of questions that were asked
+
+        Returns:
+            One answer dict per question
+        """
+        import json
+        fallback = {
+            'answer': "I couldn't generate an answer for this question.",
+            'confidence': 0.0,
+            'reasoning': 'Missing from batched model response'
+        }
+        try:
+            parsed = json.loads(content)
+            if not isinstance(parsed, list):
+                raise ValueError('Expected a JSON array')
+        except (json.JSONDecodeError, ValueError):
+            # Unparseable output: hand the raw content back on the first
+            # answer so nothing is silently lost
+            answers = [dict(fallback) for _ in range(expected)]
+            answers[0] = {
+                'answer': content,
+                'confidence': 0.3,
+                'reasoning': 'Batched response could not be parsed as JSON'
+            }
+            return answers
+
+        answers = []
+        for item in parsed[:expected]:
+            answers.append({
+                'answer': item.get('answer', ''),
+                'confidence': float(item.get('confidence', 0.7)),
+                'reasoning': item.get('reasoning', 'Generated from document analysis'),
+                'source_chunks': item.get('source_chunks', [])
+            })
+        while len(answers) < expected:
+            answers.append(dict(fallback))
+        return answers
+
     def get_document_summary(self) -> Dict[str, Any]:
         """
         Generate a summary of the loaded document
@@ -185,6 +434,68 @@ class DocumentRAGTool:
                 'summary': ''
             }
     
+    def _structure_chunk_document(self, text: str, target_words: int = 200,
+                                  overlap_words: int = 40) -> Optional[List[Dict[str, Any]]]:
+        """
+        Split document along heading lines, then pack each section to a
+        target word count
+
+        Sections stay intact instead of being cut at arbitrary character
+        offsets, which keeps related facts (e.g. all commission details)
+        inside the same chunk.
+
+        Args:
+            text: Document text to chunk
+            target_words: Target chunk size in words
+            overlap_words: Overlap between chunks within a section
+
+        Returns:
+            List of text chunks with metadata, or None when the document has
+            no detectable heading structure (caller falls back to fixed-size)
+        """
+        headings = list(_HEADING_RE.finditer(text))
+        if len(headings) < 2:
+            return None
+
+        # Section boundaries: text before the first heading, then one section
+        # per heading
+        bounds = [m.start() for m in headings] + [len(text)]
+        sections = []
+        if bounds[0] > 0:
+            sections.append((0, bounds[0]))
+        sections.extend((bounds[i], bounds[i + 1]) for i in range(len(headings)))
+
+        chunks = []
+        chunk_id = 0
+
+        for start, end in sections:
+            section_text = text[start:end].strip()
+            if not section_text:
+                continue
+
+            words = section_text.split()
+            pos = 0
+            while pos < len(words):
+                chunk_text = ' '.join(words[pos:pos + target_words])
+                text_lower = chunk_text.lower()
+                chunks.append({
+                    'id': chunk_id,
+                    'text': chunk_text,
+                    'length': len(chunk_text),
+                    'start_pos': start,
+                    'text_lower': text_lower,
+                    'term_counts': Counter(
+                        sys.intern(word) for word in _WORD_RE.findall(text_lower)
+                    )
+                })
+                chunk_id += 1
+
+                if pos + target_words >= len(words):
+                    break
+                pos += target_words - overlap_words
+
+        return chunks
+
     def _chunk_document(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[Dict[str, Any]]:
         """
         Split document into overlapping chunks for better retrieval
@@ -200,7 +511,7 @@ class DocumentRAGTool:
         chunks = []
         
         # Clean and normalize text
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = _WS_RE.sub(' ', text.strip())
         
         # Simple chunking approach - split by character count with sentence boundaries
         current_pos = 0
@@ -212,26 +523,35 @@ class DocumentRAGTool:
             
             # Try to end at a sentence boundary if possible
             if chunk_end < len(text):
-                # Look for sentence endings within the last 100 characters
+                # Look for the last sentence ending within the final 100
+                # characters; rfind scans at C speed instead of a per-char
+                # Python loop
                 search_start = max(chunk_end - 100, current_pos)
-                sentence_endings = []
-                
-                for i in range(search_start, chunk_end):
-                    if text[i] in '.!?':
-                        sentence_endings.append(i + 1)
-                
-                if sentence_endings:
-                    chunk_end = sentence_endings[-1]  # Use the last sentence ending
+                last_ending = max(
+                    text.rfind('.', search_start, chunk_end),
+                    text.rfind('!', search_start, chunk_end),
+                    text.rfind('?', search_start, chunk_end)
+                )
+                if last_ending >= 0:
+                    chunk_end = last_ending + 1
             
             # Extract chunk text
             chunk_text = text[current_pos:chunk_end].strip()
             
             if chunk_text:  # Only add non-empty chunks
+                # Lowercase and count terms once here; chunk text is
+                # immutable after this, so every later question reuses
+                # these instead of re-scanning the text
+                text_lower = chunk_text.lower()
                 chunks.append({
                     'id': chunk_id,
                     'text': chunk_text,
                     'length': len(chunk_text),
-                    'start_pos': current_pos
+                    'start_pos': current_pos,
+                    'text_lower': text_lower,
+                    'term_counts': Counter(
+                        sys.intern(word) for word in _WORD_RE.findall(text_lower)
+                    )
                 })
                 chunk_id += 1
             
@@ -255,57 +575,120 @@ class DocumentRAGTool:
         Returns:
             List of relevant chunks with relevance scores
         """
-        if not self.current_document['chunks']:
+        chunks = self.current_document['chunks']
+        if not chunks:
             return []
-        
+
         # Extract keywords from question
         question_keywords = self._extract_keywords(question.lower())
-        
-        # Score chunks based on keyword overlap
-        chunk_scores = []
-        
-        for chunk in self.current_document['chunks']:
-            chunk_text = chunk['text'].lower()
-            
-            # Calculate relevance score
-            score = 0
-            matched_keywords = []
-            
-            for keyword in question_keywords:
-                if keyword in chunk_text:
-                    # Count occurrences and weight by keyword importance
-                    occurrences = chunk_text.count(keyword)
-                    keyword_weight = len(keyword) / 10  # Longer keywords get higher weight
-                    score += occurrences * keyword_weight
-                    matched_keywords.append(keyword)
-            
-            # Boost score for exact phrase matches
-            if len(question_keywords) > 1:
-                question_phrase = ' '.join(question_keywords[:3])  # First 3 keywords
+
+        index = self.current_document.get('index')
+        if index is None:
+            # Snapshot restored from before the index existed; build it once
+            index, df = self._build_index(chunks)
+            self.current_document['index'] = index
+            self.current_document['df'] = df
+
+        chunk_by_id = {chunk['id']: chunk for chunk in chunks}
+
+        # Aggregate scores from the keyword postings into one NumPy vector:
+        # cost is O(keywords x matched chunks) with the per-posting
+        # accumulation running as C-level fancy indexing
+        scores = np.zeros(max(chunk_by_id) + 1)
+        matched_keywords: Dict[int, List[str]] = {}
+        fallback_keywords = []
+        for keyword in question_keywords:
+            postings = index.get(keyword)
+            if postings is None:
+                # Not an exact token anywhere in the document; the combined
+                # substring sweep below still catches inflected forms
+                fallback_keywords.append(keyword)
+                continue
+
+            # Weight by keyword importance; longer keywords score higher
+            keyword_weight = len(keyword) / 10
+            chunk_ids = np.fromiter(postings.keys(), dtype=np.intp, count=len(postings))
+            counts = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            scores[chunk_ids] += counts * keyword_weight
+            for chunk_id in postings:
+                matched_keywords.setdefault(chunk_id, []).append(keyword)
+
+        if fallback_keywords:
+            # One alternation regex finds every fallback keyword in a single
+            # linear pass per chunk instead of one str scan per keyword;
+            # longest-first ordering makes the longer of two overlapping
+            # keywords win at a given position
+            pattern = re.compile('|'.join(
+                re.escape(keyword)
+                for keyword in sorted(fallback_keywords, key=len, reverse=True)
+            ))
+            for chunk in chunks:
+                chunk_text = chunk.get('text_lower') or chunk['text'].lower()
+                hit_counts: Dict[str, int] = {}
+                for match in pattern.finditer(chunk_text):
+                    keyword = match.group(0)
+                    hit_counts[keyword] = hit_counts.get(keyword, 0) + 1
+                for keyword, occurrences in hit_counts.items():
+                    scores[chunk['id']] += occurrences * (len(keyword) / 10)
+                    matched_keywords.setdefault(chunk['id'], []).append(keyword)
+
+        candidates = np.nonzero(scores)[0]
+
+        # Boost score for exact phrase matches among the candidates
+        if len(question_keywords) > 1:
+            question_phrase = ' '.join(question_keywords[:3])  # First 3 keywords
+            for chunk_id in candidates:
+                chunk = chunk_by_id[chunk_id]
+                chunk_text = chunk.get('text_lower') or chunk['text'].lower()
                 if question_phrase in chunk_text:
-                    score += 5
-            
-            chunk_scores.append({
-                'chunk': chunk,
-                'score': score,
-                'matched_keywords': matched_keywords
-            })
-        
-        # Sort by relevance score and return top chunks
-        chunk_scores.sort(key=lambda x: x['score'], reverse=True)
-        
+                    scores[chunk_id] += 5
+
+        # argpartition finds the top k in O(n); only those k get sorted
+        if len(candidates) > max_chunks:
+            top = candidates[np.argpartition(scores[candidates], -max_chunks)[-max_chunks:]]
+        else:
+            top = candidates
+        top = top[np.argsort(scores[top])[::-1]]
+
         relevant_chunks = []
-        for item in chunk_scores[:max_chunks]:
-            if item['score'] > 0:  # Only include chunks with some relevance
-                relevant_chunks.append({
-                    'text': item['chunk']['text'],
-                    'relevance_score': item['score'],
-                    'matched_keywords': item['matched_keywords'],
-                    'chunk_id': item['chunk']['id']
-                })
-        
+        for chunk_id in top:
+            chunk_id = int(chunk_id)
+            relevant_chunks.append({
+                'text': chunk_by_id[chunk_id]['text'],
+                'relevance_score': float(scores[chunk_id]),
+                'matched_keywords': matched_keywords[chunk_id],
+                'chunk_id': chunk_id
+            })
+
         return relevant_chunks
     
+    @staticmethod
+    def _build_index(chunks: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[int, int]], Dict[str, int]]:
+        """
+        Build an inverted index over chunk term frequencies
+
+        Args:
+            chunks: Document chunks (term_counts are computed here if a
+                restored snapshot predates them)
+
+        Returns:
+            (token -> {chunk_id: count} postings, token -> document
+            frequency) pair
+        """
+        index: Dict[str, Dict[int, int]] = {}
+        for chunk in chunks:
+            term_counts = chunk.get('term_counts')
+            if term_counts is None:
+                chunk['text_lower'] = chunk['text'].lower()
+                term_counts = Counter(
+                    sys.intern(word) for word in _WORD_RE.findall(chunk['text_lower'])
+                )
+                chunk['term_counts'] = term_counts
+            for term, count in term_counts.items():
+                index.setdefault(term, {})[chunk['id']] = count
+        df = {term: len(postings) for term, postings in index.items()}
+        return index, df
+
     def _extract_keywords(self, text: str) -> List[str]:
         """
         Extract keywords from text for relevance matching
@@ -316,29 +699,18 @@ class DocumentRAGTool:
         Returns:
             List of keywords
         """
-        # Remove common stop words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-            'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does',
-            'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that',
-            'these', 'those', 'what', 'when', 'where', 'why', 'how', 'who', 'which'
-        }
-        
-        # Extract words and filter
-        words = re.findall(r'\b\w+\b', text.lower())
-        keywords = [word for word in words if len(word) > 2 and word not in stop_words]
-        
-        # Remove duplicates while preserving order
+        # Filter stop words and dedupe (order-preserving) in one pass
         seen = set()
-        unique_keywords = []
-        for keyword in keywords:
-            if keyword not in seen:
-                seen.add(keyword)
-                unique_keywords.append(keyword)
-        
-        return unique_keywords
+        keywords = []
+        for word in _WORD_RE.findall(text.lower()):
+            if len(word) > 2 and word not in _STOP_WORDS and word not in seen:
+                seen.add(word)
+                keywords.append(word)
+
+        return keywords
     
-    def _generate_answer(self, question: str, relevant_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _generate_answer(self, question: str, relevant_chunks: List[Dict[str, Any]],
+                         stream_callback=None) -> Dict[str, Any]:
         """
         Generate answer using retrieved chunks and LLM
         
@@ -360,32 +732,23 @@ class DocumentRAGTool:
         context = "\n\n".join([f"[Chunk {chunk['chunk_id']}]: {chunk['text']}" 
                               for chunk in relevant_chunks])
         
-        # Create prompt for answer generation
+        # Create prompt for answer generation; the instructions live in the
+        # cached system prompt, so only the context and question vary per call
         prompt = f"""
-        Based on the following document excerpts, please answer the user's question accurately and concisely.
-        
         DOCUMENT EXCERPTS:
         {context}
-        
+
         QUESTION: {question}
-        
-        Please provide your response in the following JSON format:
-        {{
-            "answer": "Your detailed answer based on the document content",
-            "confidence": 0.0-1.0,
-            "reasoning": "Brief explanation of how you arrived at this answer",
-            "source_chunks": [list of chunk IDs that were most relevant]
-        }}
-        
-        Guidelines:
-        - Only use information from the provided document excerpts
-        - If the answer isn't in the document, say so clearly
-        - Provide specific details and quotes when possible
-        - Rate your confidence based on how well the document supports your answer
-        - Be concise but comprehensive
         """
-        
-        response = self.bedrock_model.invoke_model(prompt, max_tokens=2000)
+
+        # Stream when the caller wants partial output; both paths return the
+        # same response shape
+        if stream_callback is not None:
+            response = self.bedrock_model.invoke_model_stream(
+                prompt, max_tokens=2000, system=ANSWER_SYSTEM_PROMPT, on_delta=stream_callback
+            )
+        else:
+            response = self.bedrock_model.invoke_model(prompt, max_tokens=2000, system=ANSWER_SYSTEM_PROMPT)
         
         if response['success']:
             try:
@@ -412,6 +775,20 @@ class DocumentRAGTool:
                 'reasoning': "Error in answer generation"
             }
     
+    def restore_document(self, document: Dict[str, Any]) -> None:
+        """
+        Restore a previously loaded document without re-processing
+
+        Lets callers that cache documents by content hash re-install the
+        extracted text and chunks directly, skipping text extraction and
+        chunking for files that were already ingested.
+
+        Args:
+            document: Snapshot of current_document captured after a
+                successful load_document call
+        """
+        self.current_document = dict(document)
+
     def clear_document(self):
         """Clear the currently loaded document"""
         self.current_document = {
@@ -5,14 +5,21 @@ Test script for Document Q&A functionality
 import os
 import sys
 import json
+import functools
 from src.agents.document_qa_agent import DocumentQAAgent
 from src.tools.rag_tool import DocumentRAGTool
 
+
+@functools.lru_cache(maxsize=None)
+def _shared_rag_tool():
+    """Build the RAG tool once; every test reuses the prepared instance"""
+    return DocumentRAGTool()
+
 def test_rag_tool():
     """Test the RAG tool independently"""
     print("🔍 Testing RAG Tool...")
     
-    rag_tool = DocumentRAGTool()
+    rag_tool = _shared_rag_tool()
     
     # Test document chunking with sample text
     sample_text = """
@@ -106,7 +113,7 @@ def test_mock_qa_workflow():
     """
     
     # Initialize RAG tool
-    rag_tool = DocumentRAGTool()
+    rag_tool = _shared_rag_tool()
     
     # Simulate document loading
     chunks = rag_tool._chunk_document(mock_document_text, chunk_size=300, overlap=50)
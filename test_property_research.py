@@ -5,14 +5,21 @@ Test script for Property Research Agent
 import os
 import sys
 import json
+import functools
 from src.agents.property_research_agent import PropertyResearchAgent
 from src.tools.web_search_tool import WebSearchTool
 
+
+@functools.lru_cache(maxsize=None)
+def _shared_web_tool():
+    """Build the search tool once; tests share its session and caches"""
+    return WebSearchTool()
+
 def test_web_search_tool():
     """Test the web search tool independently"""
     print("🔍 Testing Web Search Tool...")
     
-    web_tool = WebSearchTool()
+    web_tool = _shared_web_tool()
     
     # Test property search
     result = web_tool.search_property_info(
@@ -78,7 +85,7 @@ def test_mock_workflow():
     }
     
     # Test web search with extracted data
-    web_tool = WebSearchTool()
+    web_tool = _shared_web_tool()
     web_result = web_tool.search_property_info(
         property_address=mock_document_data['extracted_data']['property_address'],
         city=mock_document_data['extracted_data']['property_city'],
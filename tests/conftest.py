@@ -0,0 +1,21 @@
+"""
+Shared pytest configuration for the test suite
+"""
+import os
+import shutil
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _bulk_cleanup(tmp_path_factory):
+    """Remove the session's tmp root in one sweep after the last test
+
+    One rmtree at session end is cheaper than per-test unlinks and also
+    catches artifacts left behind by crashed runs. Set KEEP_TMP=1 to
+    skip the sweep (e.g. on throwaway CI runners, or to inspect
+    artifacts after a failure).
+    """
+    yield
+    if os.environ.get('KEEP_TMP') == '1':
+        return
+    shutil.rmtree(tmp_path_factory.getbasetemp(), ignore_errors=True)
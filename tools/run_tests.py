@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Shard the test suite across parallel pytest processes
+
+Collects the test node ids once, partitions them into ncores-2 shards
+(two cores stay reserved for the foreground), and dispatches each shard
+as its own pytest subprocess. Wall-clock time is the slowest shard
+instead of the serial sum.
+
+Usage: python tools/run_tests.py
+"""
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _collect_node_ids() -> List[str]:
+    """Collect test node ids without running anything"""
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '--collect-only', '-q', 'tests/'],
+        capture_output=True, text=True, cwd=_ROOT
+    )
+    return [line for line in result.stdout.splitlines() if '::' in line]
+
+
+def _run_shard(node_ids: List[str]) -> int:
+    """Run one shard in its own pytest process and return its exit code"""
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '-q', *node_ids], cwd=_ROOT
+    )
+    return result.returncode
+
+
+def main() -> int:
+    node_ids = _collect_node_ids()
+    if not node_ids:
+        print("❌ No tests collected")
+        return 1
+
+    # Reserve two cores for the foreground; always shard, no threshold
+    workers = max(1, (os.cpu_count() or 2) - 2)
+    shards = [node_ids[i::workers] for i in range(workers)]
+    shards = [shard for shard in shards if shard]
+
+    print(f"🚀 Running {len(node_ids)} tests in {len(shards)} shards...")
+    # Threads suffice here: each shard blocks in subprocess.run, so the
+    # parallelism comes from the child pytest processes themselves
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        exit_codes = list(pool.map(_run_shard, shards))
+
+    if any(exit_codes):
+        print("❌ Some shards failed")
+        return max(exit_codes)
+    print("✅ All shards passed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())